@@ -0,0 +1,143 @@
+# |IzyAsync|-------------------------------------------------------------------
+#
+# Project: IzyThread
+# Program: izyasync.py
+#
+# Description:
+#   This class is the asyncio counterpart of izythread.TimedThread. It runs a
+# periodic task as a coroutine on the running event loop instead of a thread
+# of its own, so hundreds of periodic jobs can share one loop. Deadlines are
+# absolute perf_counter_ns times as in TimedThread, func may be a plain
+# function or a coroutine function, and every call is timed into a
+# TimingStats. There is no spin wait, since spinning would block the loop.
+#
+# Input Arguments:
+#   name    - Name printed when the task starts and ends.
+#   func    - The function or coroutine function to execute.
+#   period  - The period between function calls in microseconds.
+#   test    - Flag to print out the timing stats when the task ends.
+#   strict  - Keep to the deadlines, otherwise wait period after each call.
+#   export  - File to save the timing stats to as JSON when the task ends.
+#   overrun - Strict mode overrun policy, as in izythread.TimedThread.
+#
+# Start (inside a coroutine):
+#   at = AsyncTimedTask("Axis 1", stream, 1000)
+#   at.start()
+# Stop:
+#   at.stop.set()
+#   await at.join()
+#
+# Version:
+# 18/10/26: Created
+# 18/10/26: Overrun policies for strict mode
+# -----------------------------------------------------------------------------
+
+# |MODULES|--------------------------------------------------------------------
+import asyncio
+import inspect
+import time
+
+from izythread import OVERRUNS, TimingStats, nextDeadline
+
+class AsyncTimedTask:
+    def __init__(self, name, func, period, test=False, strict=True, export=None, overrun='catchup'):
+        if overrun not in OVERRUNS:
+            raise ValueError("Overrun must be one of {}!!".format(", ".join(OVERRUNS)))
+        self.stop = asyncio.Event()
+        self.func = func
+        self.period = period
+        self.test = test
+        self.name = name
+        self.strict = strict
+        self.export = export
+        self.overrun = overrun
+        self.stats = TimingStats(round(period*1000))
+        self.task = None
+        self.waiter = None
+
+    def start(self):
+        self.task = asyncio.get_running_loop().create_task(self.run(), name=self.name)
+        return self.task
+
+    async def join(self):
+        await self.task
+
+    async def run(self):
+        print("Starting Async Timed Task:{}...".format(self.name))
+        # One waiter on the stop event for the whole run wakes the current
+        # sleep, instead of racing the event against every sleep.
+        stopper = asyncio.get_running_loop().create_task(self.stop.wait())
+        stopper.add_done_callback(lambda _: self.wake())
+
+        period = round(self.period*1000)
+        end = time.perf_counter_ns()
+        try:
+            while not await self.wait(end):
+                start = time.perf_counter_ns()
+                result = self.func()
+                if inspect.isawaitable(result):
+                    await result
+                finish = time.perf_counter_ns()
+                self.stats.update(end, start, finish)
+                if self.strict:
+                    end, skipped = nextDeadline(end, period, time.perf_counter_ns(), self.overrun)
+                    if skipped:
+                        self.stats.skip(skipped)
+                else:
+                    end = finish + period
+        finally:
+            stopper.cancel()
+
+        if self.export:
+            self.stats.save(self.export)
+
+        if self.test:
+            stats = self.stats.snapshot()
+            print("Jitter p50/p99/max: {:.1f}/{:.1f}/{:.1f} us, Execution mean/max: {:.1f}/{:.1f} us, "
+                  "Overruns: {}, Missed: {}, Skipped: {}".format(stats['jitter_p50_us'], stats['jitter_p99_us'], stats['jitter_max_us'],
+                                                                 stats['exec_mean_us'], stats['exec_max_us'],
+                                                                 stats['overruns'], stats['missed'], stats['skipped']))
+
+        print("...Ending Async Timed Task:{}".format(self.name))
+
+    async def wait(self, deadline):
+        # Sleeps until the deadline in perf_counter_ns or until stop is set,
+        # and yields to the loop once even when already late. Returns True
+        # once stop is set.
+        timeleft = (deadline - time.perf_counter_ns())/1e9
+        loop = asyncio.get_running_loop()
+        self.waiter = loop.create_future()
+        handle = loop.call_later(max(timeleft, 0), self.wake)
+        try:
+            await self.waiter
+        finally:
+            handle.cancel()
+            self.waiter = None
+        return self.stop.is_set()
+
+    def wake(self):
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+if __name__ == "__main__":
+
+    async def example():
+        counts = [0]*100
+
+        def make(axis):
+            async def stream():
+                counts[axis] += 1
+            return stream
+
+        tasks = [AsyncTimedTask("Axis {}".format(axis), make(axis), 10000) for axis in range(len(counts))]
+        for task in tasks:
+            task.start()
+        await asyncio.sleep(1)
+        for task in tasks:
+            task.stop.set()
+        for task in tasks:
+            await task.join()
+        print("Calls per axis: {} to {}".format(min(counts), max(counts)))
+
+    asyncio.run(example())
+    print("Success!!!")
@@ -18,9 +18,6 @@
 
 
 # |MODULES|--------------------------------------------------------------------
-import cProfile
-import io
-import pstats
 import sys
 
 import itertools as it
@@ -28,7 +25,6 @@ import tkinter as tk
 import tkinter.ttk as ttk
 import xml.etree.ElementTree as ET
 
-from pstats import SortKey
 from tkinter import N, E, W, S, font, RIDGE
 
 class IzyGui(tk.Tk):
@@ -291,6 +287,12 @@ if __name__ == "__main__":
     # Profiler Start
     useProfile = False
     if useProfile:
+        import cProfile
+        import io
+        import pstats
+
+        from pstats import SortKey
+
         pr = cProfile.Profile()
         pr.enable()
 
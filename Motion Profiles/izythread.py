@@ -4,16 +4,34 @@
 # Program: izythread.py
 #
 # Description:
-#   This class is designed for the execution of a periodic task. This module is
-# not designed for high accuracy or frequencies as it is limited by the 
-# performance of datetime module. The timeleft variable can be averaged to show
-# if there is a timed delay required between function calls. This version
-# expects the period in microseconds.
+#   This class is designed for the execution of a periodic task. Calls are
+# scheduled on absolute deadlines of the monotonic perf_counter_ns clock, so
+# the period does not drift with the time taken by func and is not moved by
+# changes to the wall clock. The thread sleeps on the stop event until spin
+# microseconds before each deadline and busy-waits the rest, which holds
+# sub-millisecond periods at the cost of a core while spinning. Every call
+# is timed into the stats of the thread (see TimingStats), which can be read
+# with et.stats.snapshot() while it runs. This version expects the period in
+# microseconds.
 #
 # Input Arguments:
 #   func    - The method to execute.
-#   period  - The period between function calls in milliseconds.
-#   test - Flag to print out
+#   period  - The period between function calls in microseconds.
+#   test    - Flag to print out
+#   strict  - Keep to the deadlines, otherwise wait period after each call.
+#   spin    - Microseconds before a deadline to stop sleeping and spin.
+#   export  - File to save the timing stats to as JSON when the thread stops.
+#   overrun - What strict mode does once a call has run past later deadlines:
+#             'catchup' runs every missed call back to back, 'skip' runs one
+#             late call and moves on to the next deadline of the original
+#             grid, 'rephase' runs one late call and restarts the grid from
+#             it. The ticks left out are counted in stats as skipped.
+#
+#   TimedScheduler runs many periodic tasks with their own periods on one
+# thread. Deadlines are kept in a heap and every task fires at
+# epoch + phase + k*period, so tasks with related periods wake together and
+# run in priority order (highest first, then the order they were added)
+# without any thread switches between them.
 #
 # Initialization:
 #   et = TimedThread(func, period, test)
@@ -29,19 +47,134 @@
 #       et.stop.set()
 #       et.join()
 #
+# Scheduler:
+#   ts = TimedScheduler("Cell", test)
+#   ts.add(stream, 1000, priority=2)
+#   ts.add(poll, 10000, phase=500)
+#   ts.start()
+#   ...
+#   ts.stop.set()
+#   ts.join()
+#
 # Original Author: Isaiah Regacho
 #
 # Version:
 # 16/03/21: Created
 # 18/06/21: Resolution increased to microseconds
+# 18/10/26: Absolute deadlines on perf_counter_ns with optional spin wait
+# 18/10/26: Jitter, execution time and overrun statistics
+# 18/10/26: TimedScheduler for many periodic tasks on one thread
+# 18/10/26: Overrun policies for strict mode
 # -----------------------------------------------------------------------------
 
 # |MODULES|--------------------------------------------------------------------
-import datetime
+import collections
+import heapq
+import itertools
+import json
 import threading
+import time
+
+class TimingStats:
+    # Live timing of a periodic thread. update is called by the thread after
+    # every call with its deadline, start and end in perf_counter_ns, and
+    # snapshot can be called from any thread while it runs. Percentiles are
+    # taken over the last window periods, everything else over the whole run.
+    # The histogram counts the period error in binwidth microsecond bins
+    # from -bins to +bins, with one more bin at each end for anything beyond.
+    def __init__(self, period, binwidth=10, bins=100, window=100000):
+        self.period = period
+        self.binwidth = binwidth*1000
+        self.bins = bins
+        self.lock = threading.Lock()
+        self.histogram = [0]*(2*bins + 2)
+        self.jitter = collections.deque(maxlen=window)
+        self.calls = 0
+        self.overruns = 0
+        self.missed = 0
+        self.skipped = 0
+        self.maxJitter = 0
+        self.execTotal = 0
+        self.execMax = 0
+        self.execTimes = collections.deque(maxlen=window)
+        self.last = None
+
+    def update(self, deadline, start, end):
+        execution = end - start
+        with self.lock:
+            self.calls += 1
+            self.execTotal += execution
+            self.execMax = max(self.execMax, execution)
+            self.execTimes.append(execution)
+            if execution > self.period:
+                self.overruns += 1
+            # Starting a full period late means the next deadline had already
+            # passed, so that one is missed as a separate call.
+            if start - deadline >= self.period:
+                self.missed += 1
+            if self.last is not None:
+                error = start - self.last - self.period
+                self.jitter.append(abs(error))
+                self.maxJitter = max(self.maxJitter, abs(error))
+                self.histogram[min(max(error//self.binwidth + self.bins + 1, 0), 2*self.bins + 1)] += 1
+            self.last = start
+
+    def skip(self, ticks):
+        with self.lock:
+            self.skipped += ticks
+
+    def snapshot(self):
+        with self.lock:
+            jitter = list(self.jitter)
+            execTimes = list(self.execTimes)
+            histogram = list(self.histogram)
+            calls, overruns, missed, skipped = self.calls, self.overruns, self.missed, self.skipped
+            maxJitter, execTotal, execMax = self.maxJitter, self.execTotal, self.execMax
+        jitter.sort()
+        execTimes.sort()
+
+        return {'period_us': self.period/1000,
+                'calls': calls,
+                'overruns': overruns,
+                'missed': missed,
+                'skipped': skipped,
+                'jitter_p50_us': percentile(jitter, 50)/1000,
+                'jitter_p99_us': percentile(jitter, 99)/1000,
+                'jitter_max_us': maxJitter/1000,
+                'exec_mean_us': execTotal/calls/1000 if calls else 0,
+                'exec_p99_us': percentile(execTimes, 99)/1000,
+                'exec_max_us': execMax/1000,
+                'histogram_edges_us': [(k - self.bins)*self.binwidth/1000 for k in range(2*self.bins + 1)],
+                'histogram_counts': histogram}
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+OVERRUNS = ['catchup', 'skip', 'rephase']
+
+def nextDeadline(deadline, period, now, overrun):
+    # The deadline after one that has just run, and the ticks skipped to get
+    # there. When now is already past it, skip and rephase hand back a
+    # deadline that has passed so exactly one late call runs right away.
+    deadline += period
+    if now <= deadline or overrun == 'catchup':
+        return deadline, 0
+    late = (now - deadline)//period + 1
+    if overrun == 'skip':
+        return deadline + (late - 1)*period, late - 1
+    return now, late - 1
+
+def percentile(values, q):
+    # Nearest rank percentile of sorted values, 0 when there are none.
+    if not values:
+        return 0
+    return values[min(len(values) - 1, int(q/100*len(values)))]
 
 class TimedThread(threading.Thread):
-    def __init__(self, name, func, period, test, strict=True):
+    def __init__(self, name, func, period, test, strict=True, spin=0, export=None, overrun='catchup'):
+        if overrun not in OVERRUNS:
+            raise ValueError("Overrun must be one of {}!!".format(", ".join(OVERRUNS)))
         threading.Thread.__init__(self)
         self.stop = threading.Event()
         self.func = func
@@ -50,29 +183,180 @@ class TimedThread(threading.Thread):
         self.test = test
         self.name = name
         self.strict = strict
+        self.spin = spin
+        self.export = export
+        self.overrun = overrun
+        self.stats = TimingStats(round(period*1000))
 
     def run(self):
         print("Starting Timed Thread:{}...".format(self.name))
-        end = datetime.datetime.now()
-        timeleft = 0
-        avg = 0
-        count = 0
-        period = datetime.timedelta(microseconds=self.period)
-        while not self.stop.wait(timeleft):
-            count += 1
-            end += period
+        period = round(self.period*1000)
+        end = time.perf_counter_ns()
+        while not self.wait(end):
+            start = time.perf_counter_ns()
             self.func()
+            finish = time.perf_counter_ns()
+            self.stats.update(end, start, finish)
             if self.strict:
-                timeleft = (end - datetime.datetime.now()).total_seconds()
+                end, skipped = nextDeadline(end, period, time.perf_counter_ns(), self.overrun)
+                if skipped:
+                    self.stats.skip(skipped)
             else:
-                timeleft = period.total_seconds()
-            avg += timeleft
+                end = finish + period
+
+        if self.export:
+            self.stats.save(self.export)
 
         if self.test:
-            print("Average Excess Thread Time: {}".format(avg/count))
+            stats = self.stats.snapshot()
+            print("Jitter p50/p99/max: {:.1f}/{:.1f}/{:.1f} us, Execution mean/max: {:.1f}/{:.1f} us, "
+                  "Overruns: {}, Missed: {}, Skipped: {}".format(stats['jitter_p50_us'], stats['jitter_p99_us'], stats['jitter_max_us'],
+                                                                 stats['exec_mean_us'], stats['exec_max_us'],
+                                                                 stats['overruns'], stats['missed'], stats['skipped']))
 
         print("...Ending Timed Thread:{}".format(self.name))
 
+    def wait(self, deadline):
+        return waitUntil(self.stop, deadline, self.spin)
+
+def waitUntil(event, deadline, spin):
+    # Sleeps on the event until spin microseconds before the deadline in
+    # perf_counter_ns, then spins out the rest. Returns True as soon as the
+    # event is set.
+    timeleft = deadline - round(spin*1000) - time.perf_counter_ns()
+    if timeleft > 0 and event.wait(timeleft/1e9):
+        return True
+    while time.perf_counter_ns() < deadline and not event.is_set():
+        pass
+    return event.is_set()
+
+class LinkedEvent(threading.Event):
+    # An Event that also sets a second one, so a thread can sleep on the
+    # second and still be woken by either.
+    def __init__(self, linked):
+        threading.Event.__init__(self)
+        self.linked = linked
+
+    def set(self):
+        threading.Event.set(self)
+        self.linked.set()
+
+class PeriodicTask:
+    # One task of a TimedScheduler. period and phase are in nanoseconds.
+    __slots__ = ('name', 'func', 'period', 'phase', 'priority', 'order', 'deadline', 'stats', 'cancelled')
+
+    def __init__(self, name, func, period, phase, priority, order):
+        self.name = name
+        self.func = func
+        self.period = period
+        self.phase = phase
+        self.priority = priority
+        self.order = order
+        self.deadline = None
+        self.stats = TimingStats(period)
+        self.cancelled = False
+
+class TimedScheduler(threading.Thread):
+    def __init__(self, name, test=False, strict=True, spin=0, overrun='catchup'):
+        if overrun not in OVERRUNS:
+            raise ValueError("Overrun must be one of {}!!".format(", ".join(OVERRUNS)))
+        threading.Thread.__init__(self)
+        # The thread sleeps on wake, which is set by stop and by any change
+        # to the tasks, so it never sleeps toward a stale deadline.
+        self.wake = threading.Event()
+        self.stop = LinkedEvent(self.wake)
+        self.setDaemon(True)
+        self.test = test
+        self.name = name
+        self.strict = strict
+        self.spin = spin
+        self.overrun = overrun
+        self.lock = threading.Lock()
+        self.tasks = []
+        self.heap = []
+        self.epoch = None
+        # Numbers tasks in the order they are added. It never goes back after
+        # a remove, so ties in the heap never reach the tasks themselves.
+        self.counter = itertools.count()
+
+    def add(self, func, period, phase=0, priority=0, name=None):
+        # Period and phase in microseconds. Tasks added while running start
+        # on the first deadline of their phase grid after now, without any
+        # of the ticks before it.
+        order = next(self.counter)
+        task = PeriodicTask(name or getattr(func, '__name__', str(order)), func,
+                            round(period*1000), round(phase*1000), priority, order)
+        with self.lock:
+            self.tasks.append(task)
+            if self.epoch is not None:
+                elapsed = time.perf_counter_ns() - self.epoch - task.phase
+                self.push(task, self.epoch + task.phase + max(elapsed//task.period + 1, 0)*task.period)
+            self.wake.set()
+        return task
+
+    def remove(self, task):
+        # The task is dropped from the heap the next time the thread wakes.
+        # Removing a task twice does nothing.
+        with self.lock:
+            task.cancelled = True
+            if task in self.tasks:
+                self.tasks.remove(task)
+            self.wake.set()
+
+    def push(self, task, deadline):
+        task.deadline = deadline
+        heapq.heappush(self.heap, (deadline, -task.priority, task.order, task))
+
+    def run(self):
+        print("Starting Timed Scheduler:{}...".format(self.name))
+        with self.lock:
+            self.epoch = time.perf_counter_ns()
+            for task in self.tasks:
+                self.push(task, self.epoch + task.phase)
+
+        while not self.stop.is_set():
+            # wake is cleared before the heap is read, so a task added after
+            # this point sets it again and cuts the wait short.
+            with self.lock:
+                self.wake.clear()
+                while self.heap and self.heap[0][3].cancelled:
+                    heapq.heappop(self.heap)
+                deadline = self.heap[0][0] if self.heap else None
+            if self.stop.is_set():
+                break
+            if deadline is None:
+                self.wake.wait()
+                continue
+            if waitUntil(self.wake, deadline, self.spin):
+                continue
+
+            with self.lock:
+                _, _, _, task = heapq.heappop(self.heap)
+            if task.cancelled:
+                continue
+            start = time.perf_counter_ns()
+            task.func()
+            finish = time.perf_counter_ns()
+            task.stats.update(task.deadline, start, finish)
+            if self.strict:
+                deadline, skipped = nextDeadline(task.deadline, task.period, time.perf_counter_ns(), self.overrun)
+                if skipped:
+                    task.stats.skip(skipped)
+            else:
+                deadline = finish + task.period
+            with self.lock:
+                if not task.cancelled:
+                    self.push(task, deadline)
+
+        if self.test:
+            for task in self.tasks:
+                stats = task.stats.snapshot()
+                print("{}: Jitter p50/p99/max: {:.1f}/{:.1f}/{:.1f} us, Overruns: {}, Missed: {}, Skipped: {}".format(
+                    task.name, stats['jitter_p50_us'], stats['jitter_p99_us'], stats['jitter_max_us'],
+                    stats['overruns'], stats['missed'], stats['skipped']))
+
+        print("...Ending Timed Scheduler:{}".format(self.name))
+
 class TimedThreadExample():
     def __init__(self, count):
         print("This example will end in:")
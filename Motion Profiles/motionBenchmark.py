@@ -0,0 +1,223 @@
+# |Motion Benchmark|-----------------------------------------------------------
+#
+# Project: ROBT 3341 - Motion Profiles
+# Program: motionBenchmark.py
+#
+# Description:
+#   This script times the planning hot path of motionProfile without Tk. It
+# sweeps profile, motion and jointInterpolation across sample counts and the
+# vectorized batch APIs across batch sizes, and records the best time,
+# throughput (samples/s), peak traced memory, the bytes of temporaries freed
+# before the run returned and the blocks still held by the result for every
+# case. Results are written as JSON and can be
+# compared against a saved baseline to catch regressions.
+#
+#   The startup benchmark imports each headless module in a fresh
+# interpreter and fails if it passes --import-budget or pulls in tkinter,
+# matplotlib or pandas. motionGUI gets the same check against
+# --gui-import-budget, where only tkinter is allowed, since plotting and
+# DataFrames must wait until the window is built.
+#
+# Execution:
+#   python motionBenchmark.py --out bench.json
+#   python motionBenchmark.py --out bench.json --baseline baseline.json
+#
+#   With a baseline, any case whose throughput falls more than --tolerance
+# below it is listed and the script exits with 1.
+# -----------------------------------------------------------------------------
+
+# |MODULES|--------------------------------------------------------------------
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import motionProfile
+
+
+# |Cases|----------------------------------------------------------------------
+# Each case builds its inputs once and returns (run, samples), where run
+# plans the case and samples is how many samples of d, v, a it produces.
+def profileCase(n):
+    t = np.linspace(0, 10, int(n))
+    return lambda: motionProfile.profile(20, -10, t, 10/3, Tm=10), t.size
+
+def batchProfileCase(moves, samples=100):
+    rng = np.random.default_rng(0)
+    displacement = rng.uniform(-100, 100, int(moves))
+    T = rng.uniform(1, 10, int(moves))
+    t = np.linspace(0, 1, samples)[None, :]*T[:, None]
+    return lambda: motionProfile.batchProfile(displacement, 0, t, T/3, T), t.size
+
+def motionCase(n):
+    # One move with the interval picked so motion builds a grid of n samples.
+    Tm, _ = motionProfile.motionTimes(100, 50, 40)
+    interval = Tm/(int(n) - 1)
+    run = lambda: motionProfile.motion(100, interval, 50, 40)
+    return run, run()[0].size
+
+def motionTimesCase(moves):
+    rng = np.random.default_rng(0)
+    displacement = rng.uniform(-100, 100, int(moves))
+    return lambda: motionProfile.motionTimes(displacement, 50, 40, 0.001), int(moves)
+
+def jointInterpolationCase(n, joints=6):
+    rng = np.random.default_rng(0)
+    displacement = rng.uniform(-100, 100, joints)
+    Tm, _ = motionProfile.motionTimes(displacement, 50, 40)
+    interval = Tm.max()/(int(n) - 1)
+    run = lambda: motionProfile.jointInterpolation(displacement, 0, interval, 50, 40)
+    return run, run()[0].shape[1]*joints
+
+SUITE = {'profile': (profileCase, 'samples', [1e2, 1e3, 1e4, 1e5, 1e6, 1e7]),
+         'batchProfile': (batchProfileCase, 'moves', [1, 1e1, 1e2, 1e3, 1e4, 1e5]),
+         'motion': (motionCase, 'samples', [1e2, 1e3, 1e4, 1e5, 1e6, 1e7]),
+         'motionTimes': (motionTimesCase, 'moves', [1, 1e1, 1e2, 1e3, 1e4, 1e5]),
+         'jointInterpolation': (jointInterpolationCase, 'samples', [1e2, 1e3, 1e4, 1e5, 1e6, 1e7])}
+
+
+# |measure|--------------------------------------------------------------------
+def measure(run, samples, repeat):
+    # Best wall time of repeat runs, then one more run under tracemalloc for
+    # the memory figures, so tracing does not skew the timings. Peak less
+    # current, read while the result is live, is what planning allocated
+    # and freed again; retained_blocks counts only what the result holds.
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = run()
+    current, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(max(s.count_diff, 0) for s in after.compare_to(before, 'lineno'))
+    del result
+
+    return {'seconds': best,
+            'samples': int(samples),
+            'throughput': samples/best if best > 0 else float('inf'),
+            'peak_bytes': peak,
+            'transient_bytes': peak - current,
+            'retained_blocks': blocks}
+
+# |measureImport|--------------------------------------------------------------
+HEADLESS = ['motionProfile', 'motionParallel', 'motionCLI', 'motionFile', 'motionBenchmark']
+HEAVY = ['tkinter', 'matplotlib', 'pandas']
+GUI = ['motionGUI']
+GUIHEAVY = ['matplotlib', 'pandas']
+
+def measureImport(module, repeat, heavy=HEAVY):
+    # Best import time of module in a fresh interpreter, and any heavy
+    # packages the import dragged in.
+    script = ("import sys, time\n"
+              "start = time.perf_counter()\n"
+              "import {}\n"
+              "print(time.perf_counter() - start)\n"
+              "print(','.join(m for m in {!r} if m in sys.modules))").format(module, heavy)
+    best, heavy = float('inf'), []
+    for _ in range(repeat):
+        lines = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__))).stdout.splitlines()
+        best = min(best, float(lines[0]))
+        heavy = [m for m in lines[1].split(',') if m] if len(lines) > 1 else []
+    return {'seconds': best, 'heavy': heavy}
+
+# |checkStartup|---------------------------------------------------------------
+def checkStartup(budget, repeat=5, guiBudget=1.0):
+    # Returns the import results and the modules that broke their budget
+    # or imported a package they must not.
+    results, failures = {}, []
+    checks = [(module, budget, HEAVY) for module in HEADLESS] + \
+             [(module, guiBudget, GUIHEAVY) for module in GUI]
+    for module, limit, heavy in checks:
+        key = "import[{}]".format(module)
+        results[key] = measureImport(module, repeat, heavy)
+        print("{:<40} {:>12.6f} s {}".format(key, results[key]['seconds'], " ".join(results[key]['heavy'])))
+        if results[key]['seconds'] > limit or results[key]['heavy']:
+            failures.append((module, limit, heavy))
+    return results, failures
+
+# |runSuite|-------------------------------------------------------------------
+def runSuite(maxSize=1e7, repeat=5, names=None):
+    results = {}
+    for name, (case, unit, sizes) in SUITE.items():
+        if names and name not in names:
+            continue
+        for size in sizes:
+            if size > maxSize:
+                continue
+            run, samples = case(size)
+            key = "{}[{}={:g}]".format(name, unit, size)
+            results[key] = measure(run, samples, repeat)
+            print("{:<40} {:>12.6f} s {:>14.3e} samples/s {:>12d} B".format(
+                key, results[key]['seconds'], results[key]['throughput'], results[key]['peak_bytes']))
+    return results
+
+# |compare|--------------------------------------------------------------------
+def compare(results, baseline, tolerance):
+    # Returns the cases whose throughput dropped more than tolerance below
+    # the baseline. Cases missing from either side are skipped.
+    regressions = []
+    for key, base in baseline.items():
+        if key not in results:
+            continue
+        ratio = results[key]['throughput']/base['throughput']
+        if ratio < 1 - tolerance:
+            regressions.append((key, ratio))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the motionProfile planning hot path.")
+    parser.add_argument('--out', default='bench.json', help="file to write the results to")
+    parser.add_argument('--baseline', help="saved results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="allowed fractional drop in throughput (default 0.2)")
+    parser.add_argument('--max-size', type=float, default=1e7,
+                        help="skip cases larger than this (default 1e7)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed runs per case (default 5)")
+    parser.add_argument('--only', nargs='*', choices=list(SUITE) + ['startup'],
+                        help="run only these benchmarks")
+    parser.add_argument('--import-budget', type=float, default=0.5,
+                        help="allowed import time in seconds for headless modules (default 0.5)")
+    parser.add_argument('--gui-import-budget', type=float, default=1.0,
+                        help="allowed import time in seconds for motionGUI (default 1.0)")
+    args = parser.parse_args()
+
+    results = runSuite(args.max_size, args.repeat, args.only)
+    startup, failures = {}, []
+    if not args.only or 'startup' in args.only:
+        startup, failures = checkStartup(args.import_budget, args.repeat, args.gui_import_budget)
+    with open(args.out, 'w') as f:
+        json.dump({'python': platform.python_version(),
+                   'numpy': np.__version__,
+                   'machine': platform.machine(),
+                   'results': results,
+                   'startup': startup}, f, indent=2)
+
+    for module, limit, heavy in failures:
+        print("STARTUP {}: over {} s or imports {}".format(module, limit, " ".join(heavy)))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        for key, ratio in regressions:
+            print("REGRESSION {}: {:.0%} of baseline throughput".format(key, ratio))
+        if not regressions:
+            print("No regressions against {}".format(args.baseline))
+    else:
+        regressions = []
+
+    if regressions or failures:
+        sys.exit(1)
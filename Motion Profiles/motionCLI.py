@@ -0,0 +1,164 @@
+# |Motion CLI|-----------------------------------------------------------------
+#
+# Project: ROBT 3341 - Motion Profiles
+# Program: motionCLI.py
+#
+# Description:
+#   This script generates setpoint tables for a batch of synchronized moves
+# without the GUI. Moves are read from a CSV or JSON job file, planned one at
+# a time with motionProfile.jointInterpolation and written out as they are
+# planned, so memory does not grow with the size of the job. Only NumPy and
+# the standard library are imported; never tkinter, matplotlib or pandas.
+#
+# Job Files:
+#   CSV  - One row per joint with the columns move, start, end, accelLimit
+#          and veloLimit. Consecutive rows with the same move form one move.
+#   JSON - {"interval": 0.001,
+#           "moves": [{"name": "pick", "start": [0, 0], "end": [60, -40],
+#                      "accelLimit": [50, 30], "veloLimit": [50, 60]}]}
+#          accelLimit and veloLimit may also be given once at the top level.
+#
+# Output:
+#   .csv - move, time, then d, v, a for every joint.
+#   .npy  - The same columns as a (rows, columns) float64 array.
+#   .traj - A motionFile trajectory of the moves played back to back on one
+#           time grid, with the name, first sample and length of each move
+#           in the header, for the executor and readTrajectory.
+#
+# Execution:
+#   python motionCLI.py job.json setpoints.npy --interval 0.001
+# -----------------------------------------------------------------------------
+
+# |MODULES|--------------------------------------------------------------------
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+import motionFile
+import motionProfile
+
+
+# |readMoves|------------------------------------------------------------------
+def readMoves(path: str):
+    # Returns the move names and (moves, joints) arrays of start, end,
+    # accelLimit and veloLimit, plus the interval if the job file sets one.
+    names, rows = [], []
+    if os.path.splitext(path)[1].lower() == '.json':
+        with open(path) as f:
+            job = json.load(f)
+        for i, move in enumerate(job['moves']):
+            names.append(str(move.get('name', i)))
+            rows.append([move['start'], move['end'],
+                         move.get('accelLimit', job.get('accelLimit', 0)),
+                         move.get('veloLimit', job.get('veloLimit', 0))])
+        interval = job.get('interval')
+    else:
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                if not names or names[-1] != row['move']:
+                    names.append(row['move'])
+                    rows.append([[], [], [], []])
+                for column, key in enumerate(['start', 'end', 'accelLimit', 'veloLimit']):
+                    rows[-1][column].append(float(row.get(key) or 0))
+        interval = None
+
+    # Limits given once for a move apply to all of its joints.
+    moves = []
+    for row in rows:
+        start = np.atleast_1d(np.asarray(row[0], dtype=float))
+        moves.append([np.broadcast_to(np.asarray(column, dtype=float), start.shape) for column in row])
+    if len({move[0].shape for move in moves}) > 1:
+        raise ValueError("Every move in {} must have the same number of joints!!".format(path))
+    start, end, accelLimit, veloLimit = (np.array(column) for column in zip(*moves))
+
+    return names, start, end, accelLimit, veloLimit, interval
+
+# |planMoves|------------------------------------------------------------------
+def planMoves(start, end, accelLimit, veloLimit, interval):
+    # Yields a (samples, 2 + 3*joints) table per move with the move index
+    # and time first, planned only when the writer asks for it.
+    for m in range(len(start)):
+        eom, time = motionProfile.jointInterpolation(end[m] - start[m], start[m], interval,
+                                                     accelLimit[m], veloLimit[m])
+        table = np.empty((time.size, 2 + eom.shape[0]*3))
+        table[:, 0] = m
+        table[:, 1] = time
+        table[:, 2:] = eom.transpose(1, 0, 2).reshape(time.size, -1)
+        yield table
+
+# |sampleCount|----------------------------------------------------------------
+def sampleCount(start, end, accelLimit, veloLimit, interval):
+    # Rows the whole job produces, known before planning so binary outputs
+    # can be sized up front and filled as moves are planned.
+    return int(sampleCounts(start, end, accelLimit, veloLimit, interval).sum())
+
+def sampleCounts(start, end, accelLimit, veloLimit, interval):
+    Tm, _ = motionProfile.motionTimes(end - start, accelLimit, veloLimit, interval)
+    return (np.rint(Tm.max(axis=1)/interval) + 1).astype(np.int64)
+
+# |columnNames|----------------------------------------------------------------
+def columnNames(joints):
+    return ['move', 'time'] + ["{}{}".format(c, j) for j in range(joints) for c in 'dva']
+
+# |writeCSV|-------------------------------------------------------------------
+def writeCSV(path, tables, columns):
+    with open(path, 'w', newline='') as f:
+        f.write(",".join(columns) + "\n")
+        for table in tables:
+            np.savetxt(f, table, delimiter=',', fmt='%.9g')
+
+# |writeNPY|-------------------------------------------------------------------
+def writeNPY(path, tables, columns, rows):
+    out = np.lib.format.open_memmap(path, mode='w+', shape=(rows, len(columns)))
+    row = 0
+    for table in tables:
+        out[row:row + len(table)] = table
+        row += len(table)
+    out.flush()
+
+# |writeTrajectory|------------------------------------------------------------
+def writeTrajectory(path, tables, names, counts, interval):
+    # The moves back to back in one motionFile trajectory. Move k starts one
+    # interval after move k - 1 ends, so the time grid stays even.
+    first = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    moves = [{'name': name, 'first': int(f), 'samples': int(n)} for name, f, n in zip(names, first, counts)]
+    out = None
+    row = 0
+    for table in tables:
+        if out is None:
+            out = motionFile.createTrajectory(path, int(counts.sum()), (table.shape[1] - 2)//3,
+                                              interval, moves=moves)
+        out[0, row:row + len(table)] = np.arange(row, row + len(table))*interval
+        out[1:, row:row + len(table)] = table[:, 2:].T
+        row += len(table)
+    out.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate setpoint tables for a batch of moves.")
+    parser.add_argument('job', help="CSV or JSON job file")
+    parser.add_argument('output', help="output file ending in .csv, .npy or .traj")
+    parser.add_argument('--interval', type=float, help="sample interval, overrides the job file")
+    args = parser.parse_args()
+
+    names, start, end, accelLimit, veloLimit, interval = readMoves(args.job)
+    interval = args.interval or interval
+    if not interval:
+        sys.exit("An interval is needed, either in the job file or with --interval")
+
+    columns = columnNames(start.shape[1])
+    tables = planMoves(start, end, accelLimit, veloLimit, interval)
+    kind = os.path.splitext(args.output)[1].lower()
+    if kind == '.csv':
+        writeCSV(args.output, tables, columns)
+    elif kind == '.npy':
+        writeNPY(args.output, tables, columns, sampleCount(start, end, accelLimit, veloLimit, interval))
+    elif kind == '.traj':
+        writeTrajectory(args.output, tables, names, sampleCounts(start, end, accelLimit, veloLimit, interval), interval)
+    else:
+        sys.exit("Unknown output type {}, use .csv, .npy or .traj".format(kind))
+
+    print("Planned {} moves to {}".format(len(names), args.output))
@@ -0,0 +1,255 @@
+# |Motion File|----------------------------------------------------------------
+#
+# Project: ROBT 3341 - Motion Profiles
+# Program: motionFile.py
+#
+# Description:
+#   This module writes planned trajectories to disk and opens them again
+# without loading them into memory.
+#
+#   A recording is a directory holding position.npy, velocity.npy and
+# acceleration.npy, each a (joints, samples) array, plus recording.json with
+# the interval and the profile parameters. recordTrajectory plans a
+# synchronized move chunk by chunk straight into memory-mapped files, so an
+# hours-long move never has to fit in RAM, and openTrajectory maps them back
+# so any time window can be sliced without reading the rest.
+#
+#   A trajectory file (.traj) is a single compact file for moving planned
+# trajectories between the planner, the executor and analysis notebooks:
+#
+#   magic     8 bytes  b'MPTRAJ01'
+#   length    8 bytes  little-endian uint64 size of the header
+#   header    JSON     joint names, channels, samples, dtype, interval,
+#                      limits, profile parameters, the moves of a job and
+#                      the data and index offsets, padded so the data
+#                      starts on 64 bytes
+#   data      one contiguous array per channel: time, then position,
+#             velocity and acceleration of every joint in turn
+#   index     optional int64 array; entry k is the first sample at or after
+#             time[0] + k*bucket, for O(1) seeking on uneven time grids
+#
+#   readTrajectory maps the file and hands out NumPy views of it, so opening
+# even a very large trajectory reads only the header. createTrajectory lays
+# out the file for a known number of samples and hands back a writable map
+# of the data, so a planner can fill it move by move.
+#
+# Usage:
+#   recordTrajectory('soak', displacement, start, 0.0005, accelLimit, veloLimit)
+#   rec = openTrajectory('soak')
+#   time, d, v, a = rec.window(3600, 3601)
+#
+#   writeTrajectory('move.traj', time, eom, joints=['R', 'Theta'])
+#   traj = readTrajectory('move.traj')
+#   time, eom = traj.window(1.0, 2.0)
+# -----------------------------------------------------------------------------
+
+# |MODULES|--------------------------------------------------------------------
+import json
+import math
+import os
+import struct
+
+import numpy as np
+import motionProfile
+
+CHANNELS = ['position', 'velocity', 'acceleration']
+MAGIC = b'MPTRAJ01'
+
+
+# |recordTrajectory|-----------------------------------------------------------
+def recordTrajectory(path: str, displacement: np.ndarray, start: np.ndarray, interval: float,
+                     accelLimit: np.ndarray, veloLimit: np.ndarray = 0,
+                     chunk: int = 65536, dtype=np.float64) -> str:
+    # Plans the same move as motionProfile.jointInterpolation but evaluates
+    # it chunk samples at a time into the memory-mapped channel files.
+    displacement = np.atleast_1d(np.asarray(displacement, dtype=float))
+    start = np.broadcast_to(np.asarray(start, dtype=float), displacement.shape)
+    Tm, Ta = motionProfile.jointTimes(displacement, interval, accelLimit, veloLimit)
+    samples = round(Tm/interval) + 1
+
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, 'recording.json'), 'w') as f:
+        json.dump({'interval': interval,
+                   'samples': samples,
+                   'joints': displacement.size,
+                   'dtype': np.dtype(dtype).str,
+                   'displacement': displacement.tolist(),
+                   'start': start.tolist(),
+                   'Ta': Ta.tolist(),
+                   'Tm': Tm}, f, indent=2)
+
+    out = [np.lib.format.open_memmap(os.path.join(path, channel + '.npy'), mode='w+',
+                                     dtype=dtype, shape=(displacement.size, samples))
+           for channel in CHANNELS]
+    for first in range(0, samples, chunk):
+        last = min(first + chunk, samples)
+        t = np.arange(first, last)*interval
+        motionProfile.batchProfile(displacement, start, t, Ta, Tm,
+                                   [channel[:, first:last] for channel in out])
+    for channel in out:
+        channel.flush()
+
+    return path
+
+# |Recording|------------------------------------------------------------------
+class Recording:
+    # Read-only memory maps of a recording. Nothing is read from disk until
+    # a slice of it is used.
+    __slots__ = ('interval', 'samples', 'meta', 'position', 'velocity', 'acceleration')
+
+    def __init__(self, path: str):
+        with open(os.path.join(path, 'recording.json')) as f:
+            self.meta = json.load(f)
+        self.interval = self.meta['interval']
+        self.samples = self.meta['samples']
+        self.position, self.velocity, self.acceleration = \
+            (np.load(os.path.join(path, channel + '.npy'), mmap_mode='r') for channel in CHANNELS)
+
+    def __len__(self):
+        return self.samples
+
+    def index(self, t: float) -> int:
+        # First sample at or after time t.
+        return min(max(math.ceil(t/self.interval - 1e-9), 0), self.samples)
+
+    def window(self, t0: float, t1: float):
+        # Time vector and (joints, samples) views of d, v, a for the samples
+        # with t0 <= t < t1, as in TrajectoryFile.window.
+        i0 = self.index(t0)
+        i1 = max(self.index(t1), i0)
+        time = np.arange(i0, i1)*self.interval
+        return time, self.position[:, i0:i1], self.velocity[:, i0:i1], self.acceleration[:, i0:i1]
+
+# |openTrajectory|-------------------------------------------------------------
+def openTrajectory(path: str) -> Recording:
+    return Recording(path)
+
+# |writeTrajectory|------------------------------------------------------------
+def writeTrajectory(path: str, time: np.ndarray, eom: np.ndarray, joints: list[str] = None,
+                    interval: float = None, limits: dict = None, profile: dict = None,
+                    bucket: float = None, dtype=np.float64) -> str:
+    # Writes a (joints, samples, 3) eom, as returned by jointInterpolation,
+    # and its time vector. Leave interval unset for uneven time grids and
+    # give bucket to store a seek index with that time resolution.
+    time = np.asarray(time)
+    eom = np.asarray(eom)
+    if eom.ndim == 2:
+        eom = eom[None]
+
+    index = None
+    if bucket:
+        edges = time[0] + np.arange(math.floor((time[-1] - time[0])/bucket) + 1)*bucket
+        index = np.searchsorted(time, edges, side='left').astype('<i8')
+
+    data = createTrajectory(path, time.size, joints or eom.shape[0], interval, limits, profile,
+                            bucket=bucket, index=index, dtype=dtype)
+    data[0] = time
+    data[1:] = eom.transpose(0, 2, 1).reshape(-1, time.size)
+    data.flush()
+
+    return path
+
+# |createTrajectory|-----------------------------------------------------------
+def createTrajectory(path: str, samples: int, joints, interval: float = None,
+                     limits: dict = None, profile: dict = None, moves: list = None,
+                     bucket: float = None, index: np.ndarray = None, dtype=np.float64) -> np.memmap:
+    # Writes the header of a trajectory file of samples samples and returns
+    # a writable (channels, samples) map of its data to fill in. joints is a
+    # list of names or a joint count. moves, for a job of back to back
+    # moves, is a list of {'name', 'first', 'samples'} entries.
+    if isinstance(joints, int):
+        joints = ["J{}".format(j) for j in range(joints)]
+    channels = ['time'] + ["{}.{}".format(joint, channel) for joint in joints for channel in CHANNELS]
+    itemsize = np.dtype(dtype).itemsize
+
+    header = {'joints': list(joints),
+              'channels': channels,
+              'samples': samples,
+              'dtype': np.dtype(dtype).newbyteorder('<').str,
+              'interval': interval,
+              'limits': limits or {},
+              'profile': profile or {},
+              'moves': moves or [],
+              'bucket': bucket}
+    # The offsets depend on the header size, so size it with placeholders
+    # wide enough for any offset and fill them in after.
+    header['offset'] = header['index'] = 10**15
+    size = len(json.dumps(header).encode())
+    offset = size + 16
+    offset += -offset % 64
+    header['offset'] = offset
+    header['index'] = offset + len(channels)*samples*itemsize if index is not None else 0
+    encoded = json.dumps(header).encode().ljust(offset - 16)
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(encoded)))
+        f.write(encoded)
+        f.truncate(offset + len(channels)*samples*itemsize)
+        if index is not None:
+            f.seek(0, os.SEEK_END)
+            index.tofile(f)
+
+    return np.memmap(path, dtype=header['dtype'], mode='r+', offset=offset,
+                     shape=(len(channels), samples))
+
+# |TrajectoryFile|-------------------------------------------------------------
+class TrajectoryFile:
+    # Zero-copy views over a memory-mapped trajectory file. eom has the
+    # (joints, samples, 3) layout of jointInterpolation but is a strided view
+    # of the per-channel arrays.
+    __slots__ = ('header', 'data', 'time', 'eom', 'index')
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            if f.read(8) != MAGIC:
+                raise ValueError("{} is not a trajectory file!!".format(path))
+            size, = struct.unpack('<Q', f.read(8))
+            self.header = json.loads(f.read(size))
+
+        header = self.header
+        joints = len(header['joints'])
+        self.data = np.memmap(path, dtype=header['dtype'], mode='r', offset=header['offset'],
+                              shape=(len(header['channels']), header['samples']))
+        self.time = self.data[0]
+        self.eom = self.data[1:].reshape(joints, 3, header['samples']).transpose(0, 2, 1)
+        self.index = None
+        if header['index']:
+            self.index = np.memmap(path, dtype='<i8', mode='r', offset=header['index'])
+
+    def __len__(self):
+        return self.header['samples']
+
+    def channel(self, name: str) -> np.ndarray:
+        return self.data[self.header['channels'].index(name)]
+
+    def seek(self, t: float) -> int:
+        # First sample at or after time t. Constant time with an interval or
+        # an index, otherwise a binary search of the time channel.
+        samples = self.header['samples']
+        if samples == 0:
+            return 0
+        t0 = float(self.time[0])
+        if self.header['interval']:
+            return min(max(math.ceil((t - t0)/self.header['interval'] - 1e-9), 0), samples)
+        if self.index is not None:
+            k = math.floor((t - t0)/self.header['bucket'])
+            if k < 0:
+                return 0
+            if k >= len(self.index):
+                lo = self.index[-1]
+                return int(lo + np.searchsorted(self.time[lo:], t, side='left'))
+            lo = self.index[k]
+            hi = self.index[k + 1] + 1 if k + 1 < len(self.index) else samples
+            return int(lo + np.searchsorted(self.time[lo:hi], t, side='left'))
+        return int(np.searchsorted(self.time, t, side='left'))
+
+    def window(self, t0: float, t1: float):
+        # Views of the time vector and eom for the samples with t0 <= t < t1.
+        i0 = self.seek(t0)
+        i1 = max(self.seek(t1), i0)
+        return self.time[i0:i1], self.eom[:, i0:i1]
+
+# |readTrajectory|-------------------------------------------------------------
+def readTrajectory(path: str) -> TrajectoryFile:
+    return TrajectoryFile(path)
@@ -51,7 +51,8 @@
 # Package              | Version    : Command
 # ==================== | ========== : =========================================
 # matplotlib           | 3.9.2      : conda install matplotlib
-# pandas               | 2.2.2      : conda install pandas
+# numpy                | 2.1.1      : conda install numpy
+# pandas (export only) | 2.2.2      : conda install pandas
 # ==================== | ========== : =========================================
 # -----------------------------------------------------------------------------
 
@@ -59,22 +60,63 @@
 import itertools
 import izygui
 import motionProfile
+import numpy as np
 
 from izythread import TimedThread
-from pandas import DataFrame
 from math import pi, cos, sin, atan2, floor, ceil
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.pyplot import subplots, tight_layout, subplots_adjust
 from tkinter import N, E, W, S, IntVar, StringVar, DoubleVar, Canvas
 from tkinter.ttk import Separator, Label, Button, Scale, Entry, Checkbutton
 
 
+# |TrajectoryModel|------------------------------------------------------------
+class TrajectoryModel:
+    # Named columns of samples in one preallocated (columns, capacity) array.
+    # Columns are contiguous views of the first n samples and the storage is
+    # only reallocated when n grows past the capacity. pandas is only needed
+    # for the dataframe export.
+    def __init__(self, columns, n=0):
+        self.columns = {name: i for i, name in enumerate(columns)}
+        self.data = np.zeros((len(columns), n))
+        self.n = n
+
+    def resize(self, n):
+        if n > self.data.shape[1]:
+            data = np.zeros((len(self.columns), n))
+            data[:, :self.n] = self.data[:, :self.n]
+            self.data = data
+        self.n = n
+
+    def __getitem__(self, name):
+        return self.data[self.columns[name], :self.n]
+
+    def __setitem__(self, name, value):
+        self.data[self.columns[name], :self.n] = value
+
+    def dataframe(self):
+        from pandas import DataFrame
+        return DataFrame({name: self[name] for name in self.columns})
+
+
 # |MotionProfileGUI|-----------------------------------------------------------
 class MotionProfileGUI(izygui.IzyGui):
     def __init__(self):
         # Initialize the Tk Root
         izygui.IzyGui.__init__(self)
 
+        # Plotting packages take seconds to import, so they are only loaded
+        # once the window is actually built.
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from matplotlib.pyplot import subplots, tight_layout
+
+        # Update Scheduler ----------------------------------------------------
+        # Writes to the Tk variables only mark them dirty. Pending changes are
+        # applied together, with a single re-plan, once Tk is idle or, with a
+        # debounce in milliseconds, once the writes stop for that long.
+        self.debounce = 0
+        self.dirty = {}
+        self.pending = None
+        self.coalesced = 0
+
         # Motion Profile Variables --------------------------------------------
         # Initialize TK Variables
         self.listMP = ['Time', 'Steps', 'Start', 'End']
@@ -85,17 +127,9 @@ class MotionProfileGUI(izygui.IzyGui):
         self.varMP['End'].set("10")
 
         # Initialize Traces
-        var_floats = ['Time', 'Start', 'End']
-        var_counts = ['Steps']
-
+        self.counts = ['Steps']
         for var in self.listMP:
-            self.varMP[var].trace_add('write', self.updatePlot)
-
-        for var in var_floats:
-            self.varMP[var].trace_add('write', self.updateFloat)
-
-        for var in var_counts:
-            self.varMP[var].trace_add('write', self.updateCount)
+            self.varMP[var].trace_add('write', self.markDirty)
 
         # Joint Interpolation Variables ---------------------------------------
         # Initialize Tk Variables
@@ -114,16 +148,9 @@ class MotionProfileGUI(izygui.IzyGui):
         self.varJI['Total Time'].set("10")
 
         # Initialize Traces
-        var_floats = ['Start A', 'Start B', 'End A', 'End B', 'Interval', 'Total Time']
-        var_counts = ['Velo. Limit A', 'Velo. Limit B', 'Accel. Limit A', 'Accel. Limit B']
+        self.counts += ['Velo. Limit A', 'Velo. Limit B', 'Accel. Limit A', 'Accel. Limit B']
         for var in self.listJI:
-            self.varJI[var].trace_add('write', self.updatePlot)
-
-        for var in var_floats:
-            self.varJI[var].trace_add('write', self.updateFloat)
-
-        for var in var_counts:
-            self.varJI[var].trace_add('write', self.updateCount)
+            self.varJI[var].trace_add('write', self.markDirty)
 
 
 
@@ -134,8 +161,11 @@ class MotionProfileGUI(izygui.IzyGui):
 
         for var in self.listPM:
             self.varPM[var].set('0')
-            self.varPM[var].trace_add('write', self.checkLimits)
-            self.varPM[var].trace_add('write', self.updateFloat)
+            self.varPM[var].trace_add('write', self.markDirty)
+
+        # Variables written by updatePlot are only parsed and checked, they
+        # never cause another re-plan.
+        self.outputs = self.listPM + ['Total Time']
 
 
         # Robot Variables -----------------------------------------------------
@@ -167,9 +197,16 @@ class MotionProfileGUI(izygui.IzyGui):
 
         self.var['Steps'] = int(self.varMP['Steps'].get())
 
+        # Memoized Profiles
+        self.cache = motionProfile.ProfileCache()
+        self.planned = {}
+        self.peaks = {}
+
         # Plots
         self.fig = [None]*3
         self.axs = [None]*3
+        self.lines = [None]*3
+        self.background = [None]*3
 
         # Layout the GUI
         p = 0
@@ -234,6 +271,10 @@ class MotionProfileGUI(izygui.IzyGui):
         self.fig[p].canvas.mpl_connect('button_press_event', self.switchplot)
         self.eomplot = FigureCanvasTkAgg(self.fig[p], self.pagedis[p])
         self.eomplot.get_tk_widget().grid(row=0, column=0, sticky=N+E+W+S, pady=5, padx=5)
+        self.lines[p] = [self.axs[p].plot([], [], linewidth=0.5, animated=True)[0] for _ in range(2)]
+        self.axs[p].set_title('Motion Profile')
+        self.axs[p].set_xlabel('Time')
+        self.fig[p].canvas.mpl_connect('draw_event', lambda event, p=p: self.cacheBackground(p))
 
         p=1
         Separator(self.pagectr[p], style='Controls.TSeparator')\
@@ -362,6 +403,10 @@ class MotionProfileGUI(izygui.IzyGui):
         self.fig[p].canvas.mpl_connect('button_press_event', self.switchplot)
         self.jointplot = FigureCanvasTkAgg(self.fig[p], self.pagedis[p])
         self.jointplot.get_tk_widget().grid(row=0, column=0, sticky=N+E+W+S, pady=5, padx=5)
+        self.lines[p] = [self.axs[p].plot([], [], linewidth=0.5, animated=True)[0] for _ in range(4)]
+        self.axs[p].set_title('Joint Interpolation')
+        self.axs[p].set_xlabel('Time')
+        self.fig[p].canvas.mpl_connect('draw_event', lambda event, p=p: self.cacheBackground(p))
 
         p = 2
         Separator(self.pagectr[p], style='Controls.TSeparator')\
@@ -431,10 +476,10 @@ class MotionProfileGUI(izygui.IzyGui):
         self.canvas.bind('<FocusIn>', self.updateCanvas)
 
         # Create List of Plots to Iterate
-        self.eomdf = DataFrame(columns=['Time', 'Displacement', 'Velocity', 'Acceleration', 'Displacement2', 'Velocity2', 'Acceleration2'])
-        self.checkdf = DataFrame(columns=['Time', 'Displacement', 'Velocity', 'Acceleration','Displacement2', 'Velocity2', 'Acceleration2', 
-                                          'Displacement A', 'Velocity A', 'Acceleration A','Displacement B', 'Velocity B', 'Acceleration B'])
-        self.jointdf = DataFrame(columns=['Time', 'Displacement A', 'Velocity A', 'Acceleration A', 'Displacement B', 'Velocity B', 'Acceleration B'])
+        self.eomdata = TrajectoryModel(['Time', 'Displacement', 'Velocity', 'Acceleration', 'Displacement2', 'Velocity2', 'Acceleration2'])
+        self.checkdata = TrajectoryModel(['Time', 'Displacement', 'Velocity', 'Acceleration','Displacement2', 'Velocity2', 'Acceleration2', 
+                                          'Displacement A', 'Velocity A', 'Acceleration A','Displacement B', 'Velocity B', 'Acceleration B'], 2)
+        self.jointdata = TrajectoryModel(['Time', 'Displacement A', 'Velocity A', 'Acceleration A', 'Displacement B', 'Velocity B', 'Acceleration B'])
 
         # Plot Cycler
         self.eom = ['Displacement', 'Velocity', 'Acceleration', 'Displacement2', 'Velocity2', 'Acceleration2']
@@ -447,7 +492,7 @@ class MotionProfileGUI(izygui.IzyGui):
 
         self.note.bind('<<NotebookTabChanged>>', self.updatePlot)
         
-        self.rt = TimedThread("Moving Robot", self.moveRobot, float(self.varJI['Interval'].get())*1000_000, True, True)
+        self.rt = TimedThread("Moving Robot", self.moveRobot, float(self.varJI['Interval'].get())*1000_000, True, True, overrun='skip')
         self.moving = False
         self.updatePlot()
         self.updateCanvas()
@@ -512,6 +557,53 @@ class MotionProfileGUI(izygui.IzyGui):
             self.var[args[0]] = int(self.globalgetvar(args[0]))
             print("{} = {}".format(args[0], self.var[args[0]]))
 
+    # -------------------------------------------------------------------------
+    # markDirty
+    #
+    # Trace callback for every Tk variable. Records the write and schedules
+    # one flushUpdates for all the writes that arrive before it runs.
+    #
+    # Last Modified: October 18, 2026
+    # -------------------------------------------------------------------------
+    def markDirty(self, *args):
+        self.dirty[args[0]] = self.dirty.get(args[0], 0) + 1
+        if self.pending is None:
+            if self.debounce:
+                self.pending = self.after(self.debounce, self.flushUpdates)
+            else:
+                self.pending = self.after_idle(self.flushUpdates)
+        elif self.debounce:
+            self.after_cancel(self.pending)
+            self.pending = self.after(self.debounce, self.flushUpdates)
+
+    # -------------------------------------------------------------------------
+    # flushUpdates
+    #
+    # Parses every dirty variable once, checks the measurements against the
+    # limits and re-plans once if any input changed, however many writes
+    # were made to it.
+    #
+    # Last Modified: October 18, 2026
+    # -------------------------------------------------------------------------
+    def flushUpdates(self):
+        self.pending = None
+        dirty, self.dirty = self.dirty, {}
+
+        for name in dirty:
+            if name in self.counts:
+                self.updateCount(name)
+            else:
+                self.updateFloat(name)
+            if name in self.listPM:
+                self.checkLimits(name)
+
+        inputs = [name for name in dirty if name not in self.outputs]
+        if inputs:
+            writes = sum(dirty[name] for name in inputs)
+            self.coalesced += writes - 1
+            print("Coalesced {} updates to {} into one re-plan ({} total)".format(writes, ", ".join(inputs), self.coalesced))
+            self.updatePlot()
+
     # -------------------------------------------------------------------------
     # checkLimits
     #
@@ -555,9 +647,12 @@ class MotionProfileGUI(izygui.IzyGui):
     # -------------------------------------------------------------------------
     # updatePlot
     #
-    # Updates the plot if any variables have changed.
+    # Updates the plot if any variables have changed. Each profile remembers
+    # the inputs it was planned with and is only re-planned when they change,
+    # the time grid is only rebuilt when Time or Steps change, and switching
+    # the plotted channel just redraws the data already planned.
     #
-    # Last Modified: November 28, 2024
+    # Last Modified: October 18, 2026
     # -------------------------------------------------------------------------
     def updatePlot(self, *args):
         # try:
@@ -567,55 +662,45 @@ class MotionProfileGUI(izygui.IzyGui):
             
         page = self.note.index('current')
         if page== 0:
-            self.eomdf = self.eomdf.head(0)
-            self.eomdf['Time'] = [x*self.var['Time']/self.var['Steps'] for x in range(self.var['Steps'] + 1)]
-            self.checkdf['Time'] = [0, max(self.eomdf['Time'])]
+            grid = (self.var['Time'], self.var['Steps'])
+            if self.planned.get('grid') != grid:
+                self.planned.update({'grid': grid, '': None, '2': None})
+                self.eomdata.resize(self.var['Steps'] + 1)
+                self.eomdata['Time'] = np.arange(self.var['Steps'] + 1)*self.var['Time']/self.var['Steps']
+
+            time = self.eomdata['Time']
+            self.checkdata['Time'] = [0, time[-1]]
             displacement = self.var['End'] - self.var['Start']
-            
-            d, v, a = motionProfile.profile(displacement, self.var['Start'], self.eomdf['Time'].tolist(), self.checkdf.iloc[1]['Time']/2)
-            self.eomdf['Displacement'] = d
-            self.eomdf['Velocity'] = v
-            self.eomdf['Acceleration'] = a
-            
-            d2, v2, a2 = motionProfile.profile(displacement, self.var['Start'], self.eomdf['Time'].tolist(), self.checkdf.iloc[1]['Time']/3)
-            self.eomdf['Displacement2'] = d2
-            self.eomdf['Velocity2'] = v2
-            self.eomdf['Acceleration2'] = a2
-
-            if self.selecteom in ('Displacement', 'Velocity', 'Acceleration'):
-                pd = d[-1]
-                pv = max([abs(velocity) for velocity in v])
-                pa = max([abs(acceleration) for acceleration in a])
-                self.checkdf['Displacement'] = [pd, pd]
-                self.checkdf['Velocity'] = [pv, pv]
-                self.checkdf['Acceleration'] = [pa, pa]
-
-            if self.selecteom in ('Displacement2', 'Velocity2', 'Acceleration2'):
-                pd = d2[-1]
-                pv = max([abs(velocity) for velocity in v2])
-                pa = max([abs(acceleration) for acceleration in a2])
-                self.checkdf['Displacement2'] = [pd, pd]
-                self.checkdf['Velocity2'] = [pv, pv]
-                self.checkdf['Acceleration2'] = [pa, pa]
+            for suffix, divisor in (('', 2), ('2', 3)):
+                inputs = (displacement, self.var['Start'])
+                if self.planned.get(suffix) == inputs:
+                    continue
+                try:
+                    d, v, a = self.cache.profile(displacement, self.var['Start'], time, time[-1]/divisor, Tm=time[-1])
+                except ValueError as e:
+                    print("Check Parameters!!! {}".format(e))
+                    return
+                self.planned[suffix] = inputs
+                self.eomdata['Displacement' + suffix] = d
+                self.eomdata['Velocity' + suffix] = v
+                self.eomdata['Acceleration' + suffix] = a
+                self.peaks[suffix] = (d[-1], np.abs(v).max(), np.abs(a).max())
+
+            suffix = '2' if self.selecteom.endswith('2') else ''
+            pd, pv, pa = self.peaks[suffix]
 
             self.varPM['Peak Velo. A'].set("{:.2f}".format(pv))
             self.varPM['Peak Accel. A'].set("{:.2f}".format(pa))
             self.varPM['Final Pos. A'].set("{:.2f}".format(pd))
         
-            self.checkdf['Displacement'] = [pd, pd]
-            self.checkdf['Velocity'] = [pv, pv]
-            self.checkdf['Acceleration'] = [pa, pa]
+            self.checkdata['Displacement' + suffix] = [pd, pd]
+            self.checkdata['Velocity' + suffix] = [pv, pv]
+            self.checkdata['Acceleration' + suffix] = [pa, pa]
 
-            self.axs[page].cla()
-            self.axs[page].plot(self.eomdf['Time'], self.eomdf[self.selecteom], linewidth=0.5, label=self.selecteom)
-            self.axs[page].plot(self.checkdf['Time'], self.checkdf[self.selecteom], linewidth=0.5)
-            self.axs[page].set_title('Motion Profile')
-            self.axs[page].set_xlabel('Time')
-            self.axs[page].set_ylabel(self.selecteom)
-            self.fig[page].canvas.draw()
+            self.drawPlot(page, [(self.eomdata['Time'], self.eomdata[self.selecteom]),
+                                 (self.checkdata['Time'], self.checkdata[self.selecteom])], self.selecteom)
 
         if page== 1:
-            self.jointdf = self.jointdf.head(0)
             dispA = self.var['End A'] - self.var['Start A']
             startA = self.var['Start A']
             dispB = self.var['End B'] - self.var['Start B']
@@ -625,34 +710,49 @@ class MotionProfileGUI(izygui.IzyGui):
             accB = self.var['Accel. Limit B']
             veloA = self.var['Velo. Limit A']
             veloB = self.var['Velo. Limit B']
-            eomA, eomB, time = motionProfile.jointInterpolation(dispA, startA, dispB, startB, interval, accA, veloA, accB, veloB)
-            self.jointdf['Displacement A'] = eomA[0]
-            self.jointdf['Displacement B'] = eomB[0]
-            self.jointdf['Velocity A'] = eomA[1]
-            self.jointdf['Velocity B'] = eomB[1]
-            self.jointdf['Acceleration A'] = eomA[2]
-            self.jointdf['Acceleration B'] = eomB[2]
-            self.jointdf['Time'] = time
-
-            self.checkdf['Time'] = [0, max(time)]
-            self.varJI['Total Time'].set("{:.2f}".format(max(time)))
-
-            pdA = eomA[0][-1]
-            pdB = eomB[0][-1]
-
-            if dispA > 0:
-                pvA = max(eomA[1])
-                paA = max(eomA[2])
-            else:
-                pvA = min(eomA[1])
-                paA = min(eomA[2])
-        
-            if dispB > 0:
-                pvB = max(eomB[1])
-                paB = max(eomB[2])
-            else:
-                pvB = min(eomB[1])
-                paB = min(eomB[2])
+
+            inputs = (dispA, startA, dispB, startB, interval, accA, veloA, accB, veloB)
+            if self.planned.get('joint') != inputs:
+                # Only inputs that planned are remembered, so fixing a bad
+                # one always re-plans.
+                try:
+                    eom, time = self.cache.jointInterpolation([dispA, dispB], [startA, startB], interval, [accA, accB], [veloA, veloB])
+                except ValueError as e:
+                    print("Check Parameters!!! {}".format(e))
+                    return
+                self.planned['joint'] = inputs
+                eomA, eomB = eom.transpose(0, 2, 1)
+                self.jointdata.resize(time.size)
+                self.jointdata['Time'] = time
+                for joint, channels in (('A', eomA), ('B', eomB)):
+                    self.jointdata['Displacement ' + joint] = channels[0]
+                    self.jointdata['Velocity ' + joint] = channels[1]
+                    self.jointdata['Acceleration ' + joint] = channels[2]
+
+                pdA = eomA[0][-1]
+                pdB = eomB[0][-1]
+
+                if dispA > 0:
+                    pvA = eomA[1].max()
+                    paA = eomA[2].max()
+                else:
+                    pvA = eomA[1].min()
+                    paA = eomA[2].min()
+            
+                if dispB > 0:
+                    pvB = eomB[1].max()
+                    paB = eomB[2].max()
+                else:
+                    pvB = eomB[1].min()
+                    paB = eomB[2].min()
+
+                self.peaks['joint'] = (time[-1], pdA, pvA, paA, pdB, pvB, paB)
+
+            # The other tab shares the check lines and measurements, so they
+            # are restored even when nothing was re-planned.
+            total, pdA, pvA, paA, pdB, pvB, paB = self.peaks['joint']
+            self.checkdata['Time'] = [0, total]
+            self.varJI['Total Time'].set("{:.2f}".format(total))
 
             self.varPM['Final Pos. A'].set("{:.2f}".format(pdA))
             self.varPM['Peak Velo. A'].set("{:.2f}".format(pvA))
@@ -662,22 +762,92 @@ class MotionProfileGUI(izygui.IzyGui):
             self.varPM['Peak Velo. B'].set("{:.2f}".format(pvB))
             self.varPM['Peak Accel. B'].set("{:.2f}".format(paB))
         
-            self.checkdf['Displacement A'] = [pdA, pdA]
-            self.checkdf['Velocity A'] = [pvA, pvA]
-            self.checkdf['Acceleration A'] = [paA, paA]
-            self.checkdf['Displacement B'] = [pdB, pdB]
-            self.checkdf['Velocity B'] = [pvB, pvB]
-            self.checkdf['Acceleration B'] = [paB, paB]
-
-            self.axs[page].cla()
-            self.axs[page].plot(self.jointdf['Time'], self.jointdf[self.selectjoint + ' A'], linewidth=0.5, label=self.selectjoint + ' A')
-            self.axs[page].plot(self.jointdf['Time'], self.jointdf[self.selectjoint + ' B'], linewidth=0.5, label=self.selectjoint + ' B')
-            self.axs[page].plot(self.checkdf['Time'], self.checkdf[self.selectjoint + ' A'], linewidth=0.5)
-            self.axs[page].plot(self.checkdf['Time'], self.checkdf[self.selectjoint + ' B'], linewidth=0.5)
-            self.axs[page].set_title('Joint Interpolation')
-            self.axs[page].set_xlabel('Time')
-            self.axs[page].set_ylabel(self.selectjoint)
-            self.fig[page].canvas.draw()
+            self.checkdata['Displacement A'] = [pdA, pdA]
+            self.checkdata['Velocity A'] = [pvA, pvA]
+            self.checkdata['Acceleration A'] = [paA, paA]
+            self.checkdata['Displacement B'] = [pdB, pdB]
+            self.checkdata['Velocity B'] = [pvB, pvB]
+            self.checkdata['Acceleration B'] = [paB, paB]
+
+            self.drawPlot(page, [(self.jointdata['Time'], self.jointdata[self.selectjoint + ' A']),
+                                 (self.jointdata['Time'], self.jointdata[self.selectjoint + ' B']),
+                                 (self.checkdata['Time'], self.checkdata[self.selectjoint + ' A']),
+                                 (self.checkdata['Time'], self.checkdata[self.selectjoint + ' B'])], self.selectjoint)
+
+    # -------------------------------------------------------------------------
+    # drawPlot
+    #
+    # Moves the lines of a page to the new data. The lines are created once
+    # and only they are blitted over the cached background; a full redraw is
+    # only scheduled, with draw_idle, when the axes limits or label change.
+    #
+    # Last Modified: October 18, 2026
+    # -------------------------------------------------------------------------
+    def drawPlot(self, page, data, ylabel):
+        for line, (x, y) in zip(self.lines[page], data):
+            line.set_data(x, y)
+
+        ax = self.axs[page]
+        x0 = min(np.min(x) for x, _ in data)
+        x1 = max(np.max(x) for x, _ in data)
+        y0 = min(np.min(y) for _, y in data)
+        y1 = max(np.max(y) for _, y in data)
+        rescaled = [self.rescale(getlim, setlim, lo, hi) for getlim, setlim, lo, hi in
+                    ((ax.get_xlim, ax.set_xlim, x0, x1), (ax.get_ylim, ax.set_ylim, y0, y1))]
+
+        if any(rescaled) or ax.get_ylabel() != ylabel or self.background[page] is None:
+            ax.set_ylabel(ylabel)
+            self.fig[page].canvas.draw_idle()
+        else:
+            self.blitPlot(page)
+
+    # -------------------------------------------------------------------------
+    # rescale
+    #
+    # Fits one axis to the data range plus a margin. The view is kept while
+    # the data fits inside it and still fills most of it, so small changes
+    # to a parameter do not force a full redraw.
+    #
+    # Last Modified: October 18, 2026
+    # -------------------------------------------------------------------------
+    def rescale(self, getlim, setlim, lo, hi):
+        if not (np.isfinite(lo) and np.isfinite(hi)):
+            return False
+
+        pad = 0.05*(hi - lo) or 0.5
+        viewlo, viewhi = getlim()
+        if viewlo <= lo and hi <= viewhi and hi - lo + 2*pad >= 0.8*(viewhi - viewlo):
+            return False
+
+        setlim(lo - pad, hi + pad)
+        return True
+
+    # -------------------------------------------------------------------------
+    # cacheBackground
+    #
+    # Runs after every full draw of a page. Saves the axes, ticks and labels
+    # without the lines for blitting, then draws the lines on top.
+    #
+    # Last Modified: October 18, 2026
+    # -------------------------------------------------------------------------
+    def cacheBackground(self, page):
+        self.background[page] = self.fig[page].canvas.copy_from_bbox(self.fig[page].bbox)
+        for line in self.lines[page]:
+            self.axs[page].draw_artist(line)
+
+    # -------------------------------------------------------------------------
+    # blitPlot
+    #
+    # Redraws only the lines of a page over its cached background.
+    #
+    # Last Modified: October 18, 2026
+    # -------------------------------------------------------------------------
+    def blitPlot(self, page):
+        canvas = self.fig[page].canvas
+        canvas.restore_region(self.background[page])
+        for line in self.lines[page]:
+            self.axs[page].draw_artist(line)
+        canvas.blit(self.fig[page].bbox)
     
     # -------------------------------------------------------------------------
     # switchPlot
@@ -699,7 +869,7 @@ class MotionProfileGUI(izygui.IzyGui):
     #
     # Left-clicking the plot will update Position 2.
     #
-    # Last Modified: November 16, 2024
+    # Last Modified: October 18, 2026
     # -------------------------------------------------------------------------
     def updateP2(self, event):
         if self.moving == False:
@@ -729,12 +899,17 @@ class MotionProfileGUI(izygui.IzyGui):
             accB = self.var['Accel. Limit B']
             
 
-            self.motionR, self.motionTheta, time = motionProfile.jointInterpolation(R2 - R1, R1, Theta2 - Theta1, Theta1, interval,accA, velA, accB, velB)
+            try:
+                eom, time = self.cache.jointInterpolation([R2 - R1, Theta2 - Theta1], [R1, Theta1], interval, [accA, accB], [velA, velB])
+            except ValueError as e:
+                print("Check Parameters!!! {}".format(e))
+                return
+            self.motionR, self.motionTheta = eom.transpose(0, 2, 1)
             self.index = 0
-            self.varJI['Total Time'].set("{:.2f}".format(max(time)))
+            self.varJI['Total Time'].set("{:.2f}".format(time[-1]))
             if self.rt.is_alive():
                 self.rt.join(timeout=5)
-            self.rt = TimedThread("Moving Robot", self.moveRobot, float(self.varJI['Interval'].get())*1000_000, True, True)
+            self.rt = TimedThread("Moving Robot", self.moveRobot, float(self.varJI['Interval'].get())*1000_000, True, True, overrun='skip')
             
             self.rt.start()
 
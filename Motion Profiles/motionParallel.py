@@ -0,0 +1,135 @@
+# |Motion Parallel|------------------------------------------------------------
+#
+# Project: ROBT 3341 - Motion Profiles
+# Program: motionParallel.py
+#
+# Description:
+#   This module plans large sets of synchronized moves with
+# motionProfile.jointInterpolation across a pool of processes. The move list
+# is split into contiguous shards and every worker writes its moves straight
+# into one shared buffer, either shared memory or a memory-mapped .npy file,
+# so nothing is pickled on the way back and the output order is the order of
+# the move list.
+#
+# Usage:
+#   result = planMoves(displacement, start, interval, accelLimit, veloLimit)
+#   eom, time = result[m]
+#
+#   displacement and start are (moves, joints). The limits are (joints,) or
+# (moves, joints). On platforms that spawn processes the call must sit under
+# an if __name__ == "__main__" guard.
+#
+#   Without a path the result is copied out of shared memory before it is
+# released, so the end of the call briefly holds the output twice. Pass a
+# path for the low-memory mode, where the result stays memory-mapped.
+# -----------------------------------------------------------------------------
+
+# |MODULES|--------------------------------------------------------------------
+import os
+import numpy as np
+import motionProfile
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+
+# |PlanResult|-----------------------------------------------------------------
+class PlanResult:
+    # Planned moves packed back to back in one flat buffer. Indexing returns
+    # the (joints, samples, 3) eom of a move as a view, and its time vector.
+    __slots__ = ('data', 'offsets', 'counts', 'joints', 'interval')
+
+    def __init__(self, data, offsets, counts, joints, interval):
+        self.data = data
+        self.offsets = offsets
+        self.counts = counts
+        self.joints = joints
+        self.interval = interval
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __getitem__(self, m):
+        n = self.counts[m]
+        eom = self.data[self.offsets[m]:self.offsets[m] + self.joints*n*3]
+        return eom.reshape(self.joints, n, 3), np.arange(n)*self.interval
+
+
+# |planMoves|------------------------------------------------------------------
+def planMoves(displacement: np.ndarray, start: np.ndarray, interval: float,
+              accelLimit: np.ndarray, veloLimit: np.ndarray = 0,
+              workers: int = None, path: str = None) -> PlanResult:
+    # Plans every move and returns them in move order. With a path the
+    # moves are written to a .npy file that stays on disk and is mapped
+    # back, which is the low-memory mode. Otherwise they come back through
+    # shared memory and are copied into an ordinary array, so the output is
+    # held twice for a moment.
+    displacement = np.atleast_2d(np.asarray(displacement, dtype=float))
+    moves, joints = displacement.shape
+    start = np.broadcast_to(np.asarray(start, dtype=float), displacement.shape)
+    accelLimit = np.broadcast_to(np.asarray(accelLimit, dtype=float), displacement.shape)
+    veloLimit = np.broadcast_to(np.asarray(veloLimit, dtype=float), displacement.shape)
+
+    # The sample count of every move is known up front, which fixes where
+    # each one lands in the buffer before any worker starts.
+    Tm, _ = motionProfile.motionTimes(displacement, accelLimit, veloLimit, interval)
+    counts = np.rint(Tm.max(axis=1)/interval).astype(np.int64) + 1
+    offsets = np.concatenate(([0], np.cumsum(joints*counts*3)))
+    size = int(offsets[-1])
+
+    workers = workers or os.cpu_count()
+    bounds = np.linspace(0, moves, min(moves, workers*4) + 1).astype(int)
+    shards = [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+    shm = None
+    if path is None:
+        shm = SharedMemory(create=True, size=max(size, 1)*8)
+        target = shm.name
+    else:
+        np.lib.format.open_memmap(path, mode='w+', shape=(size,)).flush()
+        target = path
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Each shard only gets the offsets of its own moves, so the
+            # work sent to the pool grows with the shard, not the job.
+            jobs = [pool.submit(_planShard, target, shm is not None, size, offsets[i:j],
+                                displacement[i:j], start[i:j], interval,
+                                accelLimit[i:j], veloLimit[i:j])
+                    for i, j in shards]
+            for job in jobs:
+                job.result()
+
+        if shm is None:
+            data = np.load(path, mmap_mode='r+')
+        else:
+            data = np.ndarray((size,), dtype=float, buffer=shm.buf).copy()
+    finally:
+        if shm is not None:
+            shm.close()
+            shm.unlink()
+
+    return PlanResult(data, offsets[:-1], counts, joints, interval)
+
+# |_planShard|-----------------------------------------------------------------
+def _planShard(target, shared, size, offsets, displacement, start, interval,
+               accelLimit, veloLimit):
+    # Runs in a worker. Plans the moves of one shard and writes move m into
+    # the shared buffer at offsets[m].
+    if shared:
+        shm = SharedMemory(name=target)
+        data = np.ndarray((size,), dtype=float, buffer=shm.buf)
+    else:
+        data = np.load(target, mmap_mode='r+')
+
+    for m in range(len(displacement)):
+        eom, _ = motionProfile.jointInterpolation(displacement[m], start[m], interval,
+                                                  accelLimit[m], veloLimit[m])
+        begin = offsets[m]
+        data[begin:begin + eom.size] = eom.ravel()
+
+    if shared:
+        del data
+        shm.close()
+    else:
+        data.flush()
@@ -1,87 +1,489 @@
 # |profile|--------------------------------------------------------------------
+import hashlib
+import math
 import numpy as np
 
-def profile(displacement: float, start: float, time: list[float], Ta: float) -> \
-    tuple[list[float], list[float], list[float]]:
+from collections import OrderedDict
 
-    d = []
-    v = []
-    a = []
-    time = np.array(time)
+def profile(displacement: float, start: float, time: list[float], Ta: float,
+            aslist: bool = False, Tm: float = None, out: tuple = None, dtype=np.float64) -> \
+    tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # The whole time grid is evaluated at once. Set aslist to get plain
+    # Python lists back for callers that still expect them. Tm defaults to
+    # the largest time in the grid. Results are written into the (d, v, a)
+    # arrays of out when given, or new arrays of dtype otherwise.
+    time = np.asarray(time)
 
-    T = 2*Ta 
-    Tm = max(time)
+    if Tm is None:
+        Tm = time.max()
+    d, v, a = _evaluate(time, displacement, start, Ta, Tm, out, dtype)
+
+    if aslist:
+        return d.tolist(), v.tolist(), a.tolist()
+    return d, v, a
+
+# |batchProfile|---------------------------------------------------------------
+def batchProfile(displacement: np.ndarray, start: np.ndarray, time: np.ndarray,
+                 Ta: np.ndarray, Tm: np.ndarray = None, out: tuple = None, dtype=np.float64) -> \
+    tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # One row per move. The time grid is either shared (samples,) or given
+    # per move (moves, samples). Tm defaults to the last time of each row.
+    # Returns (moves, samples) arrays of d, v and a.
+    displacement = np.asarray(displacement, dtype=float).reshape(-1, 1)
+    start = np.asarray(start, dtype=float).reshape(-1, 1)
+    Ta = np.asarray(Ta, dtype=float).reshape(-1, 1)
+    time = np.atleast_2d(np.asarray(time))
+
+    if Tm is None:
+        Tm = time.max(axis=1, keepdims=True)
+    else:
+        Tm = np.asarray(Tm, dtype=float).reshape(-1, 1)
+
+    return _evaluate(time, displacement, start, Ta, Tm, out, dtype)
+
+# |streamProfile|--------------------------------------------------------------
+def streamProfile(displacement: float, start: float, Ta: float, Tm: float,
+                  interval: float, chunk: int = 65536, out: tuple = None, dtype=np.float64):
+    # Yields (t, d, v, a) arrays of at most chunk samples from 0 to Tm at
+    # interval, so memory stays the same however long the move is. Pull
+    # chunks with next() from a TimedThread func or a file writer loop.
+    # With out, every chunk is a view into the same four (t, d, v, a)
+    # buffers of at least chunk samples, so use it before the next one.
+    # dtype only applies to d, v and a. Time is built from int64 sample
+    # indices in float64, since float32 cannot count past 2**24 samples.
+    if interval <= 0 or chunk <= 0:
+        raise ValueError("Interval and chunk must be greater than 0!!")
+
+    samples = int(np.ceil(Tm/interval - 1e-9)) + 1
+    index = np.arange(min(chunk, samples), dtype=np.int64)
+    for first in range(0, samples, chunk):
+        n = min(chunk, samples - first)
+        if out is None:
+            buffers = [np.empty(n)] + [np.empty(n, dtype) for _ in range(3)]
+        else:
+            buffers = [b[:n] for b in out]
+
+        t = buffers[0] if buffers[0].dtype == np.float64 else np.empty(n)
+        np.add(index[:n], first, out=t)
+        t *= interval
+        result = _evaluate(t, displacement, start, Ta, Tm, buffers[1:], dtype)
+        if t is not buffers[0]:
+            np.copyto(buffers[0], t, casting='same_kind')
+        yield (buffers[0],) + result
+
+# |Profile|--------------------------------------------------------------------
+class Profile:
+    # A single move compiled once from (displacement, start, Ta, Tm). Calling
+    # it at a time, or an array of times, returns (d, v, a) without a time
+    # grid, so a control tick can sample the exact time it runs at.
+    __slots__ = ('displacement', 'start', 'Ta', 'Tm', 'am', 'Da', 'Tb', 'vm', 'w')
+
+    def __init__(self, displacement: float, start: float, Ta: float, Tm: float):
+        self.displacement = float(displacement)
+        self.start = float(start)
+        self.Ta = float(Ta)
+        self.Tm = float(Tm)
+        am, Da, Tb, vm = _coefficients(self.displacement, self.Ta, self.Tm)
+        self.am = float(am)
+        self.Da = float(Da)
+        self.Tb = float(Tb)
+        self.vm = float(vm)
+        self.w = math.pi/(2*self.Ta) if self.Ta > 0 else 0.0
+
+    def __call__(self, t, out: tuple = None, dtype=np.float64):
+        if np.ndim(t):
+            return _phases(np.asarray(t), self.start, self.Ta, self.Tm,
+                           self.am, self.Da, self.Tb, self.vm, out, dtype)
+
+        # Scalar path in plain floats, which beats NumPy scalars per call.
+        if t < 0:
+            return self.start, 0.0, 0.0
+        if t > self.Tm:
+            return self.start + self.displacement, 0.0, 0.0
+        shift = min(max(t - self.Ta, 0.0), self.Tb)
+        phase = (t - shift)*self.w
+        c = math.cos(phase)
+        return self.start + self.Da*(1 - c) + self.vm*shift, \
+            self.vm*math.sin(phase), self.am*c
+
+    def position(self, t):
+        return self(t)[0]
+
+    def velocity(self, t):
+        return self(t)[1]
+
+    def acceleration(self, t):
+        return self(t)[2]
+
+    def timeAtPosition(self, x):
+        # Time the move passes position x, for a scalar or an array of
+        # positions, straight from the inverted phases:
+        #   t = arccos(1 - (r - vm*shift)/Da)/w + shift
+        # with r = x - start and shift = clip((r - Da)/vm, 0, Tb). Positions
+        # the move never reaches give nan.
+        r = np.asarray(x, dtype=float) - self.start
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = r/self.displacement
+            shift = np.clip((r - self.Da)/self.vm, 0, self.Tb)
+            phase = np.arccos(np.clip(1 - (r - self.vm*shift)/self.Da, -1, 1))
+        t = phase/self.w + shift
+
+        return np.where((fraction >= 0) & (fraction <= 1), t, np.nan)
+
+    def timeAtVelocity(self, v, falling: bool = False):
+        # Time the move first reaches velocity v while accelerating, or with
+        # falling, the time it drops back to v while decelerating. Velocities
+        # beyond the cruise velocity, or of the wrong sign, give nan.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fraction = np.asarray(v, dtype=float)/self.vm
+        phase = np.arcsin(np.clip(fraction, -1, 1))
+        if falling:
+            t = (np.pi - phase)/self.w + self.Tb
+        else:
+            t = phase/self.w
+
+        return np.where((fraction >= 0) & (fraction <= 1), t, np.nan)
+
+# |Trajectory|-----------------------------------------------------------------
+class Trajectory:
+    # A chain of moves through waypoints, planned once and evaluated over a
+    # global time grid in one pass. Each segment takes its time from
+    # durations (with Ta defaulting to half of it) or, without durations,
+    # from the fastest move within accelLimit and veloLimit.
+    #
+    # With blend, each segment starts its acceleration while the previous
+    # one is still decelerating, overlapping by the shorter of the two Ta,
+    # so the chain flows through waypoints instead of stopping. Velocity and
+    # acceleration of both segments add during a blend. With durations a
+    # blend can peak above either segment on its own; planned from the
+    # limits, each overlap is shrunk until the sums stay within them.
+    __slots__ = ('waypoints', 'begin', 'Ta', 'Tm', 'am', 'Da', 'Tb', 'vm', 'duration')
+
+    def __init__(self, waypoints: np.ndarray, durations: np.ndarray = None, Ta: np.ndarray = None,
+                 accelLimit: np.ndarray = 0, veloLimit: np.ndarray = 0, blend: bool = False):
+        waypoints = np.asarray(waypoints, dtype=float)
+        D = np.diff(waypoints)
+
+        if durations is None:
+            Tm, Ta = motionTimes(D, accelLimit, veloLimit)
+        else:
+            Tm = np.broadcast_to(np.asarray(durations, dtype=float), D.shape)
+            Ta = Tm/2 if Ta is None else np.broadcast_to(np.asarray(Ta, dtype=float), D.shape)
+        Tm = np.atleast_1d(Tm)
+        Ta = np.atleast_1d(Ta)
+
+        # Repeated waypoints are not moves and are dropped. Every real move
+        # needs a positive duration and a blend of at most half of it.
+        keep = D != 0
+        if not keep.any():
+            raise ValueError("Trajectory needs at least one move between waypoints!!")
+        if np.any(Tm[keep] <= 0):
+            raise ValueError("Durations must be greater than 0 between different waypoints!!")
+        if np.any((Ta[keep] <= 0) | (Ta[keep] > Tm[keep]/2)):
+            raise ValueError("Ta must be greater than 0 and at most half of the duration!!")
+        self.waypoints = np.append(waypoints[0], waypoints[1:][keep])
+        D, Tm, Ta = D[keep], Tm[keep], Ta[keep]
+
+        self.Ta = Ta
+        self.Tm = Tm
+        self.am, self.Da, self.Tb, self.vm = _coefficients(D, Ta, Tm)
+
+        overlap = np.zeros_like(Tm)
+        if blend:
+            overlap[1:] = np.minimum(Ta[:-1], Ta[1:])
+            if durations is None:
+                overlap = self._fitBlends(overlap, np.broadcast_to(accelLimit, keep.shape)[keep],
+                                          np.broadcast_to(veloLimit, keep.shape)[keep])
+        self.begin = np.concatenate(([0], np.cumsum(Tm[:-1]))) - np.cumsum(overlap)
+        self.duration = float(self.begin[-1] + Tm[-1])
+
+    def __call__(self, t, out: tuple = None, dtype=np.float64):
+        # At most two segments overlap, so each sample only needs the
+        # segment it is in (k) and the one before it, which has either
+        # finished or is blending out.
+        t = np.asarray(t, dtype=float)
+        k = np.maximum(np.searchsorted(self.begin, t, side='right') - 1, 0)
+        j = np.maximum(k - 1, 0)
+
+        d, v, a = self._segment(t, k, out, dtype)
+        dp, vp, ap = self._segment(t, j, None, dtype)
+        prev = k > 0
+        d += np.where(prev, dp - self.waypoints[k], 0.0)
+        v += np.where(prev, vp, 0.0)
+        a += np.where(prev, ap, 0.0)
+
+        return d, v, a
+
+    def _fitBlends(self, overlap, accelLimit, veloLimit, steps=16, samples=257):
+        # Largest overlap at each waypoint, out of steps fractions of the full
+        # one, whose summed v and a stay within the limits of both segments.
+        # The sums are checked at samples points across the overlap, which
+        # can miss a peak by at most ~1e-5 of it, so that much is kept in
+        # hand. No overlap always fits, since each segment does on its own.
+        A = np.asarray(accelLimit, dtype=float)
+        V = np.where(np.asarray(veloLimit, dtype=float) > 0, veloLimit, np.inf)
+        A = np.minimum(A[:-1], A[1:])*(1 - 2e-5)
+        V = np.minimum(V[:-1], V[1:])*(1 - 2e-5)
+        s = np.linspace(0, 1, samples)
+
+        fitted = np.zeros_like(overlap)
+        for k in range(1, len(overlap)):
+            for fraction in np.linspace(1, 0, steps + 1)[:-1]:
+                o = overlap[k]*fraction
+                _, vp, ap = _phases(self.Tm[k-1] - o + s*o, 0, self.Ta[k-1], self.Tm[k-1], self.am[k-1],
+                                    self.Da[k-1], self.Tb[k-1], self.vm[k-1])
+                _, vn, an = _phases(s*o, 0, self.Ta[k], self.Tm[k], self.am[k],
+                                    self.Da[k], self.Tb[k], self.vm[k])
+                if np.abs(vp + vn).max() <= V[k-1] and np.abs(ap + an).max() <= A[k-1]:
+                    fitted[k] = o
+                    break
+
+        return fitted
+
+    def _segment(self, t, k, out, dtype):
+        return _phases(t - self.begin[k], self.waypoints[k], self.Ta[k], self.Tm[k],
+                       self.am[k], self.Da[k], self.Tb[k], self.vm[k], out, dtype)
+
+# |_coefficients|--------------------------------------------------------------
+def _coefficients(displacement, Ta, Tm):
+    # Peak acceleration, displacement covered while accelerating, cruise time
+    # and cruise velocity. Works on scalars or broadcastable arrays. A zero
+    # Ta only comes from a move of zero displacement, which stays at rest.
     Tb = Tm - 2*Ta
-    am = displacement*np.pi**2 / (8*Ta**2+2*Ta*(Tm-2*Ta)*np.pi)
-    Da = displacement/2 - (am*2*Ta*(Tm-2*Ta))/(2*np.pi)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        am = np.where(np.asarray(Ta) > 0, np.divide(displacement*np.pi**2, 8*Ta**2+2*Ta*Tb*np.pi), 0.0)
+    Da = displacement/2 - (am*2*Ta*Tb)/(2*np.pi)
+    vm = am*((2*Ta)/np.pi)
     #am = ((np.pi**2)*2*Da)/(2* (T**2))
     #Da = (am*((2*Ta)**2))/(np.pi)**2
 
-    for t in time: # loop to get all the motion data 
-        if 0 <= t < Ta: # Accleration part 
-            aa = am*np.cos((np.pi * t) / (2 * Ta))
-            va = am*2*(Ta/np.pi)*np.sin((np.pi*t)/(2*Ta))
-            da = Da - Da*np.cos((np.pi*t)/(2*Ta))
-
-            a.append(aa)
-            v.append(va)
-            d.append(da)
-
-        elif Ta <= t <= Tb + Ta: # Constant velocity part 
-            ab = 0
-            vb = am*((2*Ta)/np.pi)
-            db = am*(((2*Ta)/np.pi)*t) - am*(((2*Ta)/np.pi)*Ta) + Da
-            a.append(ab)
-            v.append(vb)
-            d.append(db)
-
-        elif Ta + Tb <= t <= Tm:  # Deceleration part 
-            ac = am*np.cos((np.pi*(t-Tb))/(2 *Ta))
-            vc = am*((2*Ta)/np.pi)*np.sin((np.pi*(t-Tb))/(2*Ta))
-            dc = -Da*np.cos((np.pi*(t-Tb))/(2*Ta)) + am * ((2*Ta)/np.pi)*Tb + Da
-
-            a.append(ac)
-            v.append(vc)
-            d.append(dc)
+    return am, Da, Tb, vm
 
-        else:
-            a.append(0)
-            v.append(0)
-            d.append(0)
+# |_evaluate|------------------------------------------------------------------
+def _evaluate(time, displacement, start, Ta, Tm, out=None, dtype=np.float64):
+    # The three phases share one form once the cruise time already travelled
+    # (shift) is pulled out of t:
+    #   accel : shift = 0,      phase = pi*t/(2Ta)
+    #   cruise: shift = t - Ta, phase = pi/2
+    #   decel : shift = Tb,     phase = pi*(t - Tb)/(2Ta)
+    # so a = am*cos(phase), v = vm*sin(phase), d = Da*(1 - cos(phase)) +
+    # vm*shift. Samples outside [0, Tm] hold the end positions at rest.
+    am, Da, Tb, vm = _coefficients(displacement, Ta, Tm)
 
+    return _phases(time, start, Ta, Tm, am, Da, Tb, vm, out, dtype)
 
-    return d,v,a
+def _phases(time, start, Ta, Tm, am, Da, Tb, vm, out=None, dtype=np.float64):
+    # Works in place in the three output arrays, so with out given nothing
+    # the size of the grid is allocated except a mask when samples fall
+    # outside [0, Tm]. am = Da*w**2 lets a reuse the Da*cos(phase) term.
+    if out is None:
+        shape = np.broadcast_shapes(np.shape(time), np.shape(Tm), np.shape(Ta),
+                                    np.shape(start), np.shape(am))
+        out = [np.empty(shape, dtype) for _ in range(3)]
+    d, v, a = out
+    with np.errstate(divide='ignore'):
+        w = np.where(np.asarray(Ta) > 0, np.pi/(2*np.asarray(Ta, dtype=float)), 0.0)
+
+    if d.dtype.itemsize >= 8:
+        np.clip(time, 0, Tm, out=a)                 # t
+        np.subtract(a, Ta, out=d)
+        np.clip(d, 0, Tb, out=d)                    # shift
+        np.subtract(a, d, out=v)
+        np.multiply(v, w, out=v)                    # phase
+        np.cos(v, out=a)                            # cos(phase)
+        np.sin(v, out=v)
+        np.multiply(v, vm, out=v)
+        np.multiply(d, vm, out=d)
+        np.add(d, start + Da, out=d)
+    else:
+        # Narrower outputs would round t before the phase is taken, so t,
+        # shift and phase are kept in float64 and only the results are
+        # rounded to the output dtype.
+        t = np.clip(np.asarray(time, dtype=np.float64), 0, Tm)
+        shift = np.clip(t - Ta, 0, Tb)
+        phase = (t - shift)*w
+        np.cos(phase, out=a)                        # cos(phase)
+        np.sin(phase, out=v)
+        np.multiply(v, vm, out=v)
+        np.copyto(d, shift*vm + (start + Da), casting='same_kind')
+    np.multiply(a, Da, out=a)
+    np.subtract(d, a, out=d)
+    np.multiply(a, w**2, out=a)
+
+    if np.ndim(Tm) == 0:
+        outside = time.size and (time.min() < 0 or time.max() > Tm)
+    else:
+        outside = True
+    if outside:
+        inside = (time >= 0) & (time <= Tm)
+        np.copyto(a, 0, where=~inside)
+        np.copyto(v, 0, where=~inside)
+
+    return d, v, a
 
 # |motion|---------------------------------------------------------------------
 def motion(displacement: float, interval: float, accelLimit: float = 0, veloLimit: float = 0) -> \
-    tuple[list[float], float]:
+    tuple[np.ndarray, float]:
     # Given the acceleration limit and velocity limit,
-    # Find the fastest time for the move.
-    time = []
-    Ta = 0 
-    #am = ((np.pi**2)*displacement)/(2* (T**2))
+    # Find the fastest time for the move and the time grid at interval.
+    # One move only: a shared grid would stretch every shorter move to the
+    # longest, so arrays of moves go through motionTimes instead.
+    if interval <= 0:
+        raise ValueError("Interval must be greater than 0!!")
+    if np.ndim(displacement) or np.ndim(accelLimit) or np.ndim(veloLimit):
+        raise ValueError("motion plans one move, use motionTimes for arrays of moves!!")
+
+    Tm, Ta = motionTimes(displacement, accelLimit, veloLimit, interval)
+    time = np.arange(round(Tm/interval) + 1)*interval
 
-    # fastest time is when there is no constant velocity time part 
-    T = np.sqrt(((np.pi**2)*displacement))/(2 * accelLimit)
-    Ta = T / 2
-    Tm = 2 * Ta
-    #time = 
+    return time, Ta
 
-    return time,Ta
+# |motionTimes|----------------------------------------------------------------
+def motionTimes(displacement: np.ndarray, accelLimit: np.ndarray,
+                veloLimit: np.ndarray = 0, interval: float = 0) -> \
+    tuple[np.ndarray, np.ndarray]:
+    # Closed form move time Tm and blend time Ta for scalars or arrays of
+    # moves. With peak values am and vm of the profile,
+    #   vm = pi*D/(4Ta + pi*Tb),  am = pi**2*D/(2Ta*(4Ta + pi*Tb))
+    # the fastest move is triangular (Tb = 0) until vm would pass the
+    # velocity limit at D = 2*V**2/A, after which it cruises at V. A
+    # veloLimit of 0 means unlimited. Tm is rounded up to a whole number of
+    # intervals when one is given, which only lowers am and vm.
+    D = np.abs(np.asarray(displacement, dtype=float))
+    A = np.asarray(accelLimit, dtype=float)
+    V = np.asarray(veloLimit, dtype=float)
+    if np.any(A <= 0):
+        raise ValueError("Acceleration limit must be greater than 0!!")
+    V = np.where(V > 0, V, np.inf)
+
+    cruise = D > 2*V**2/A
+    with np.errstate(divide='ignore', invalid='ignore'):
+        Ta = np.where(cruise, np.pi*V/(2*A), np.pi*np.sqrt(D/(8*A)))
+        Tm = np.where(cruise, D/V + (np.pi - 2)*V/A, 2*Ta)
+
+    if interval > 0:
+        Tm = np.ceil(Tm/interval - 1e-9)*interval
+
+    if Tm.ndim == 0:
+        return float(Tm), float(Ta)
+    return Tm, Ta
 
 # |jointInterpolation|---------------------------------------------------------
-def jointInterpolation(displacementA: float, startA: float,
-                       displacementB: float, startB: float, interval: float, 
-                       accelLimitA:float = 0, veloLimitA:float = 0, 
-                       accelLimitB: float = 0, veloLimitB:float =0) -> \
-                       tuple[tuple[list[float], list[float], list[float]], 
-                                tuple[list[float], list[float], list[float]], 
-                                list[float]]:
-    # Given the acceleration limit and velocity limits for two joints,
-    # Find the fastest time for the move and
-    # Coordinate the joints to move together.   
-    eomA = profile(0, 0, [0], 0)
-    eomB = profile(0, 0, [0], 0)
-    time = []
-
-    return eomA, eomB, time
\ No newline at end of file
+def jointInterpolation(displacement: np.ndarray, start: np.ndarray, interval: float,
+                       accelLimit: np.ndarray, veloLimit: np.ndarray = 0,
+                       out: np.ndarray = None, dtype=np.float64) -> \
+                       tuple[np.ndarray, np.ndarray]:
+    # Given the acceleration limits and velocity limits for any number of
+    # joints, find the fastest time for the move and coordinate the joints
+    # to move together. The joint with the longest move sets Tm and every
+    # other joint is stretched to it. Returns a (joints, samples, 3) array of
+    # d, v, a and the shared time vector. out, when given, must be at least
+    # that large and the leading samples of it are filled.
+    displacement = np.atleast_1d(np.asarray(displacement, dtype=float))
+    start = np.broadcast_to(np.asarray(start, dtype=float), displacement.shape)
+
+    Tm, Ta = jointTimes(displacement, interval, accelLimit, veloLimit)
+    time = np.arange(round(Tm/interval) + 1)*interval
+
+    if out is None:
+        eom = np.empty((displacement.size, time.size, 3), dtype)
+    else:
+        eom = out[:displacement.size, :time.size]
+    batchProfile(displacement, start, time, Ta, Tm, (eom[..., 0], eom[..., 1], eom[..., 2]))
+
+    return eom, time
+
+# |jointTimes|-----------------------------------------------------------------
+def jointTimes(displacement: np.ndarray, interval: float, accelLimit: np.ndarray,
+               veloLimit: np.ndarray = 0) -> tuple[float, np.ndarray]:
+    # The shared move time Tm, rounded to interval, and the blend time Ta of
+    # every joint that jointInterpolation plans with.
+    displacement = np.atleast_1d(np.asarray(displacement, dtype=float))
+    veloLimit = np.broadcast_to(np.asarray(veloLimit, dtype=float), displacement.shape)
+
+    if interval <= 0:
+        raise ValueError("Interval must be greater than 0!!")
+
+    Tm, _ = motionTimes(displacement, accelLimit, veloLimit, interval)
+    Tm = round(np.max(Tm)/interval)*interval
+
+    return Tm, _stretch(displacement, Tm, veloLimit)
+
+# |_stretch|-------------------------------------------------------------------
+def _stretch(displacement, Tm, veloLimit):
+    # Blend time for each joint when its move has to take Tm. Since vm grows
+    # and am falls with Ta, take the longest blend that keeps vm within the
+    # velocity limit:
+    #   vm = pi*D/(pi*Tm - (2*pi - 4)*Ta) <= V
+    # Tm is at least each joint's own fastest time, so am stays in limit.
+    D = np.abs(displacement)
+    V = np.where(veloLimit > 0, veloLimit, np.inf)
+    Ta = (np.pi*Tm - np.pi*D/V)/(2*np.pi - 4)
+
+    return np.minimum(Ta, Tm/2)
+
+
+# |ProfileCache|---------------------------------------------------------------
+class ProfileCache:
+    # Memoizes profile and jointInterpolation on their normalized parameters
+    # and time grid. Least recently used results are evicted once the cached
+    # arrays pass maxbytes. Cached arrays are returned read-only since they
+    # are shared between callers.
+    def __init__(self, maxbytes: int = 256*1024**2):
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.entries = OrderedDict()
+
+    def profile(self, displacement: float, start: float, time: list[float], Ta: float,
+                aslist: bool = False, Tm: float = None):
+        time = np.asarray(time, dtype=float)
+        key = ('profile', float(displacement), float(start), float(Ta),
+               None if Tm is None else float(Tm), _gridKey(time))
+        d, v, a = self._fetch(key, lambda: profile(displacement, start, time, Ta, Tm=Tm))
+
+        if aslist:
+            return d.tolist(), v.tolist(), a.tolist()
+        return d, v, a
+
+    def jointInterpolation(self, displacement: np.ndarray, start: np.ndarray, interval: float,
+                           accelLimit: np.ndarray, veloLimit: np.ndarray = 0):
+        key = ('jointInterpolation', _floatKey(displacement), _floatKey(start),
+               float(interval), _floatKey(accelLimit), _floatKey(veloLimit))
+        return self._fetch(key, lambda: jointInterpolation(displacement, start, interval,
+                                                           accelLimit, veloLimit))
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+    def _fetch(self, key, compute):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        result = compute()
+        size = 0
+        for array in result:
+            array.setflags(write=False)
+            size += array.nbytes
+
+        if size <= self.maxbytes:
+            self.entries[key] = (result, size)
+            self.nbytes += size
+            while self.nbytes > self.maxbytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.nbytes -= evicted
+
+        return result
+
+def _floatKey(value):
+    return tuple(np.atleast_1d(np.asarray(value, dtype=float)).tolist())
+
+def _gridKey(time):
+    # Digest of the grid rather than the grid itself, to keep keys small.
+    return time.shape, hashlib.blake2b(np.ascontiguousarray(time).tobytes(), digest_size=16).digest()